@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
+import multiprocessing
 
 from controller import AppController
 from ui.main_window import MainWindow
 
 def main():
+    multiprocessing.freeze_support()  # 패키징(exe) 환경에서 워커 프로세스 부트스트랩
     controller = AppController()
     app = MainWindow(controller=controller)
     app.mainloop()
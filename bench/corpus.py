@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""벤치마크/회귀 테스트용 합성 코퍼스 생성기(외부 파일 불필요, seed로 재현 가능).
+
+    <dest>/root_0/post_00/1.jpg, 2.png, 3.webp …
+    <dest>/corpus.json   # 생성 파라미터(같으면 재생성하지 않음)
+"""
+from __future__ import annotations
+import json
+import math
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+from PIL import Image, ImageDraw
+
+from settings import RootConfig
+
+@dataclass
+class CorpusSpec:
+    roots: int = 2
+    posts_per_root: int = 3
+    files_per_post: int = 4
+    min_mp: float = 1.0
+    max_mp: float = 12.0
+    seed: int = 0
+
+# 미리 정해둔 규모(벤치 명령행 --preset)
+PRESETS = {
+    "tiny": CorpusSpec(roots=1, posts_per_root=2, files_per_post=3, min_mp=0.5, max_mp=2.0),
+    "small": CorpusSpec(),
+    "large": CorpusSpec(roots=3, posts_per_root=6, files_per_post=6, min_mp=1.0, max_mp=50.0),
+}
+
+_ASPECTS = [(4, 3), (3, 2), (16, 9), (1, 1), (3, 4), (2, 3), (9, 16)]
+
+def _synth(size, rng: random.Random, mode: str) -> Image.Image:
+    """그라디언트 + 도형 + 노이즈(인코더가 너무 쉽게 압축하지 않도록)."""
+    W, H = size
+    base = Image.radial_gradient("L").resize((W, H), Image.Resampling.BILINEAR)
+    noise = Image.effect_noise((max(1, W // 4), max(1, H // 4)), 40).resize((W, H), Image.Resampling.BILINEAR)
+    r = Image.eval(base, lambda v, o=rng.randint(0, 255): (v + o) % 256)
+    g = noise
+    b = Image.linear_gradient("L").resize((W, H), Image.Resampling.BILINEAR)
+    im = Image.merge("RGB", (r, g, b))
+    d = ImageDraw.Draw(im)
+    for _ in range(12):
+        x0, y0 = rng.randrange(W), rng.randrange(H)
+        x1, y1 = x0 + rng.randrange(1, W // 3 + 2), y0 + rng.randrange(1, H // 3 + 2)
+        d.ellipse((x0, y0, x1, y1), fill=tuple(rng.randrange(256) for _ in range(3)))
+    if mode == "RGBA":
+        alpha = Image.radial_gradient("L").resize((W, H)).point(lambda v: 255 - v)
+        im.putalpha(alpha)
+    return im
+
+def _save(im: Image.Image, dst: Path, kind: str, rng: random.Random):
+    if kind == "jpeg":
+        exif = Image.Exif()
+        # 일부는 EXIF 회전(6=90° CW, 8=90° CCW, 3=180°)
+        orient = rng.choice([1, 1, 3, 6, 8])
+        if orient != 1:
+            exif[0x0112] = orient
+        im.convert("RGB").save(dst, format="JPEG", quality=90, exif=exif)
+    elif kind == "png":
+        im.save(dst, format="PNG", compress_level=1)
+    else:
+        im.save(dst, format="WEBP", quality=85)
+
+def make_corpus(dest: Path, spec: CorpusSpec = CorpusSpec()) -> List[RootConfig]:
+    dest = Path(dest)
+    marker = dest / "corpus.json"
+    want = asdict(spec)
+    roots = [RootConfig(path=dest / f"root_{i}", wm_text=f"Bench {i}") for i in range(spec.roots)]
+    try:
+        if json.loads(marker.read_text(encoding="utf-8")) == want:
+            return roots
+    except Exception:
+        pass
+
+    rng = random.Random(spec.seed)
+    for rc in roots:
+        for p in range(spec.posts_per_root):
+            post = rc.path / f"post_{p:02d}"
+            post.mkdir(parents=True, exist_ok=True)
+            for n in range(1, spec.files_per_post + 1):
+                mp = rng.uniform(spec.min_mp, spec.max_mp)
+                aw, ah = rng.choice(_ASPECTS)
+                h = int(math.sqrt(mp * 1e6 * ah / aw)); w = int(h * aw / ah)
+                kind = rng.choice(["jpeg", "jpeg", "jpeg", "png", "webp"])
+                mode = "RGBA" if kind != "jpeg" and rng.random() < 0.5 else "RGB"
+                ext = {"jpeg": ".jpg", "png": ".png", "webp": ".webp"}[kind]
+                _save(_synth((w, h), rng, mode), post / f"{n}{ext}", kind, rng)
+    marker.write_text(json.dumps(want), encoding="utf-8")
+    return roots
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""최적화 렌더 경로의 픽셀 동등성 회귀 검사.
+
+    python -m bench.regress --update        # 기준(골든) 이미지 생성
+    python -m bench.regress                 # 최적화 경로를 골든과 비교, 실패 시 diff 이미지 저장
+
+기준 경로: 풀해상도 load_image → resize_contain → 전체 프레임 오버레이 워터마크(원래 구현)
+비교 경로: services.pipeline.render_outputs (축소 디코드, 스프라이트 합성 등 최적화 포함)
+"""
+from __future__ import annotations
+import argparse
+import json
+import math
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageStat
+
+from settings import AppSettings, DEFAULT_SIZES
+from controller import AppController
+from services.image_ops import load_image
+from services.resize import resize_contain
+from services.pipeline import render_outputs
+from services.watermark import DEFAULT_FONT_CANDIDATES
+from bench.corpus import CorpusSpec, make_corpus
+
+# 고정 코퍼스(seed 고정). 축소 디코드가 실제로 걸리도록 큰 원본 포함
+REGRESS_SPEC = CorpusSpec(roots=2, posts_per_root=2, files_per_post=3, min_mp=2.0, max_mp=24.0, seed=1234)
+
+# 기본 허용치: PSNR 하한, 픽셀 허용 오차와 그 초과 픽셀 비율 상한
+DEFAULT_PSNR_MIN = 36.0  # 합성 노이즈 원본에서 DCT 축소 디코드가 ~37dB 수준
+DEFAULT_PIXEL_TOL = 32
+DEFAULT_MAX_BAD_RATIO = 0.002
+
+# ---- 기준 경로용 폰트 맞춤: 최적화 경로의 폰트/레이아웃 캐시를 쓰지 않는 원래 구현 ----
+def reference_font(size: int, font_path: Path | None = None):
+    for cand in ([str(font_path)] if font_path else []) + DEFAULT_FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(cand, size=size)
+        except Exception:
+            pass
+    return ImageFont.load_default()
+
+def reference_measure(font, text: str, stroke_width: int = 0) -> Tuple[int, int]:
+    bbox = ImageDraw.Draw(Image.new("RGB", (10, 10))).textbbox((0, 0), text, font=font, stroke_width=stroke_width)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+def reference_fit(text: str, target_w: int, stroke_width: int, font_path: Path | None = None, low=8, high=512) -> int:
+    """폭 target_w에 맞는 가장 큰 폰트 크기(매번 이분 탐색)."""
+    best = low
+    while low <= high:
+        mid = (low + high) // 2
+        w, _ = reference_measure(reference_font(mid, font_path), text, stroke_width)
+        if w <= target_w:
+            best = mid; low = mid + 1
+        else:
+            high = mid - 1
+    return best
+
+def reference_watermark(img: Image.Image, text: str, settings: AppSettings) -> Image.Image:
+    """스프라이트/레이아웃 캐시 이전의 원래 방식: 캔버스 크기 오버레이에 그려 전체 프레임 합성."""
+    if not text:
+        return img
+    W, H = img.size
+    target_w = max(1, int(min(W, H) * (settings.wm_scale_pct / 100.0)))
+    font = reference_font(reference_fit(text, target_w, settings.wm_stroke_width, settings.wm_font_path),
+                          settings.wm_font_path)
+    tw, th = reference_measure(font, text, settings.wm_stroke_width)
+    ax = min(1.0, max(0.0, float(settings.wm_anchor[0])))
+    ay = min(1.0, max(0.0, float(settings.wm_anchor[1])))
+    x = int(round(ax * W - tw / 2)); y = int(round(ay * H - th / 2))
+    x = max(0, min(x, W - tw)); y = max(0, min(y, H - th))
+    alpha = int(255 * (settings.wm_opacity / 100.0))
+    over = Image.new("RGBA", (W, H), (0, 0, 0, 0))
+    ImageDraw.Draw(over).text(
+        (x, y), text, font=font, fill=(*settings.wm_fill_color, alpha),
+        stroke_width=max(0, int(settings.wm_stroke_width)), stroke_fill=(*settings.wm_stroke_color, alpha))
+    return Image.alpha_composite(img.convert("RGBA"), over).convert("RGB")
+
+def reference_render(src: Path, size: Tuple[int, int], settings: AppSettings, wm_text: str) -> Image.Image:
+    im = load_image(src)
+    return reference_watermark(resize_contain(im, size, settings.bg_color), wm_text, settings)
+
+def compare_images(ref: Image.Image, out: Image.Image, tol: int) -> dict:
+    if ref.size != out.size:
+        return {"size_mismatch": [list(ref.size), list(out.size)], "psnr": 0.0, "bad_ratio": 1.0, "max": 255}
+    diff = ImageChops.difference(ref.convert("RGB"), out.convert("RGB"))
+    mse = sum(v * v for v in ImageStat.Stat(diff).rms) / 3.0
+    psnr = float("inf") if mse == 0 else 10 * math.log10(255.0 ** 2 / mse)
+    # 픽셀별 채널 최대 오차(루마로 바꾸면 한 채널만 틀린 색 오류가 희석된다)
+    r, g, b = diff.split()
+    gray = ImageChops.lighter(ImageChops.lighter(r, g), b)
+    hist = gray.histogram()
+    bad = sum(hist[tol + 1:])
+    return {
+        "psnr": round(psnr, 3) if psnr != float("inf") else "inf",
+        "max": max(hi for _, hi in diff.getextrema()),
+        "bad_ratio": bad / float(gray.width * gray.height),
+    }
+
+def _write_diff(ref: Image.Image, out: Image.Image, dst: Path):
+    """기준 | 결과 | 차이(증폭) 나란히."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    ref = ref.convert("RGB"); out = out.convert("RGB").resize(ref.size)
+    amp = ImageChops.difference(ref, out).point(lambda v: min(255, v * 8))
+    sheet = Image.new("RGB", (ref.width * 3, ref.height), (0, 0, 0))
+    for i, im in enumerate((ref, out, amp)):
+        sheet.paste(im, (i * ref.width, 0))
+    sheet.save(dst)
+
+def _cases(roots, settings: AppSettings):
+    posts = AppController().scan_posts_multi(roots)
+    for key, meta in posts.items():
+        wm_text = (meta["root"].wm_text or "").strip() or settings.default_wm_text
+        for src in meta["files"]:
+            yield key, src, wm_text
+
+def _golden_name(key: str, src: Path, size) -> str:
+    return f"{key.replace('/', '__')}__{src.stem}__{size[0]}x{size[1]}.png"
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m bench.regress")
+    ap.add_argument("--corpus", type=Path, default=Path(tempfile.gettempdir()) / "simple_watermark_regress")
+    ap.add_argument("--golden", type=Path, default=Path("regress_golden"), help="기준 이미지 디렉터리")
+    ap.add_argument("--update", action="store_true", help="기준 경로로 골든 이미지를 (재)생성")
+    ap.add_argument("--psnr-min", type=float, default=DEFAULT_PSNR_MIN)
+    ap.add_argument("--tol", type=int, default=DEFAULT_PIXEL_TOL, help="픽셀 허용 오차(0-255, 채널 최대 기준)")
+    ap.add_argument("--max-bad-ratio", type=float, default=DEFAULT_MAX_BAD_RATIO)
+    ap.add_argument("--diff-dir", type=Path, default=None, help="실패 diff 저장 위치(기본: <golden>/diff)")
+    args = ap.parse_args(argv)
+
+    roots = make_corpus(args.corpus, REGRESS_SPEC)
+    settings = AppSettings(sizes=list(DEFAULT_SIZES), default_wm_text="Regress ㈜하이브랩",
+                           wm_opacity=60, wm_scale_pct=30, wm_anchor=(0.8, 0.85))
+    golden: Path = args.golden
+    diff_dir = args.diff_dir or golden / "diff"
+
+    if args.update:
+        golden.mkdir(parents=True, exist_ok=True)
+        n = 0
+        for key, src, wm_text in _cases(roots, settings):
+            for size in settings.sizes:
+                reference_render(src, size, settings, wm_text).save(golden / _golden_name(key, src, size))
+                n += 1
+        print(f"wrote {n} golden images to {golden}")
+        return 0
+
+    results: List[Dict] = []
+    failed = 0
+    for key, src, wm_text in _cases(roots, settings):
+        for size, out in render_outputs(src, settings.sizes, settings, wm_text):
+            name = _golden_name(key, src, size)
+            gpath = golden / name
+            # 골든이 없으면 기준 경로를 즉석 렌더해 비교
+            ref = Image.open(gpath).convert("RGB") if gpath.exists() else reference_render(src, size, settings, wm_text)
+            r = compare_images(ref, out, args.tol)
+            psnr = float("inf") if r["psnr"] == "inf" else r["psnr"]
+            ok = "size_mismatch" not in r and psnr >= args.psnr_min and r["bad_ratio"] <= args.max_bad_ratio
+            r.update(name=name, ok=ok)
+            results.append(r)
+            if not ok:
+                failed += 1
+                _write_diff(ref, out, diff_dir / name)
+            print(f"{'ok  ' if ok else 'FAIL'} {name}  psnr={r['psnr']} max={r['max']} bad={r['bad_ratio']:.5f}")
+
+    print(json.dumps({"cases": len(results), "failed": failed}, ensure_ascii=False))
+    if failed:
+        print(f"diff images: {diff_dir}", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
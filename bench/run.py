@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""렌더 파이프라인 벤치마크.
+
+    python -m bench.run --preset small --workers 1,2,4 --out bench_results/
+    python -m bench.run --compare bench_results/old.json bench_results/new.json
+
+- micro: 서비스 함수별(load_image / resize_contain(_multi) / add_text_watermark / save_jpeg) 시간
+- e2e  : AppController.run_batch 전체, 워커 수별
+결과는 커밋 해시가 붙은 JSON으로 저장해 커밋 간 비교한다.
+"""
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import PIL
+
+from settings import AppSettings, DEFAULT_SIZES
+from controller import AppController
+from services.image_ops import load_image, max_target_box
+from services.resize import resize_contain, resize_contain_multi
+from services.watermark import add_text_watermark
+from services.writer import save_jpeg
+from bench.corpus import PRESETS, make_corpus
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, timeout=10).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+def _time(fn: Callable[[], object], repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); samples.append(time.perf_counter() - t0)
+    return {"min": round(min(samples), 6), "median": round(statistics.median(samples), 6), "repeat": repeat}
+
+def bench_micro(files: List[Path], settings: AppSettings, repeat: int, tmp: Path) -> Dict[str, dict]:
+    """파일별로 단계 함수를 따로 잰다(각 단계 입력은 미리 준비)."""
+    box = max_target_box(settings.sizes)
+    out: Dict[str, dict] = {}
+    for src in files:
+        full = load_image(src); full.load()
+        rec = {
+            "src_mp": round(full.width * full.height / 1e6, 2),
+            "format": src.suffix.lower().lstrip("."),
+            "load_full": _time(lambda: load_image(src).load(), repeat),
+            "load_box": _time(lambda: load_image(src, box).load(), repeat),
+        }
+        im = load_image(src, box); im.load()
+        src_size = im.info["source_size"]
+        rec["resize_each"] = _time(lambda: [resize_contain(im, s, settings.bg_color, src_size) for s in settings.sizes], repeat)
+        rec["resize_multi"] = _time(lambda: resize_contain_multi(im, settings.sizes, settings.bg_color, src_size), repeat)
+        for size in settings.sizes:
+            tag = f"{size[0]}x{size[1]}"
+            canvas = resize_contain(im, size, settings.bg_color)
+            wm = lambda: add_text_watermark(
+                canvas, text=settings.default_wm_text, opacity_pct=settings.wm_opacity,
+                scale_pct=settings.wm_scale_pct, fill_rgb=settings.wm_fill_color,
+                stroke_rgb=settings.wm_stroke_color, stroke_width=settings.wm_stroke_width,
+                anchor_norm=settings.wm_anchor, font_path=settings.wm_font_path)
+            final = wm()
+            rec[f"resize_{tag}"] = _time(lambda: resize_contain(im, size, settings.bg_color), repeat)
+            rec[f"watermark_{tag}"] = _time(wm, repeat)
+            rec[f"save_{tag}"] = _time(lambda: save_jpeg(final, tmp / f"micro_{tag}.jpg"), repeat)
+        out[src.relative_to(src.parents[2]).as_posix()] = rec
+    return out
+
+def bench_e2e(roots, settings: AppSettings, workers_list: List[int], tmp: Path) -> List[dict]:
+    ctrl = AppController()
+    posts = ctrl.scan_posts_multi(roots)
+    results = []
+    for n in workers_list:
+        out_dir = tmp / f"e2e_w{n}"
+        shutil.rmtree(out_dir, ignore_errors=True)  # 매니페스트 스킵이 끼지 않도록 매번 비움
+        s = replace(settings, output_root=out_dir, workers=n)
+        summary: dict = {}
+        errors: List[str] = []
+        t0 = time.perf_counter()
+        ctrl.run_batch(s, posts, None, lambda p, k: summary.update(processed=p, skipped=k), errors.append)
+        elapsed = time.perf_counter() - t0
+        processed = summary.get("processed", 0)
+        results.append({
+            "workers": n,
+            "elapsed_s": round(elapsed, 3),
+            "outputs": processed,
+            "images_per_s": round(processed / elapsed, 3) if elapsed else 0.0,
+            "errors": len(errors),
+        })
+        print(f"  e2e workers={n}: {elapsed:.2f}s, {processed} outputs", file=sys.stderr)
+    return results
+
+def compare(base_path: Path, new_path: Path):
+    base = json.loads(Path(base_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"{base['meta']['commit']} -> {new['meta']['commit']}")
+    rows = []
+    for f, rec in new.get("micro", {}).items():
+        old = base.get("micro", {}).get(f)
+        if not old:
+            continue
+        for k, v in rec.items():
+            if isinstance(v, dict) and k in old:
+                rows.append((f"{f}:{k}", old[k]["median"], v["median"]))
+    for e in new.get("e2e", []):
+        old = next((o for o in base.get("e2e", []) if o["workers"] == e["workers"]), None)
+        if old:
+            rows.append((f"e2e workers={e['workers']}", old["elapsed_s"], e["elapsed_s"]))
+    for name, a, b in rows:
+        ratio = (b / a) if a else float("nan")
+        print(f"{name:60s} {a:10.4f} {b:10.4f}  x{ratio:5.2f}")
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m bench.run")
+    ap.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    ap.add_argument("--corpus", type=Path, default=Path(tempfile.gettempdir()) / "simple_watermark_bench",
+                    help="합성 코퍼스 위치(파라미터가 같으면 재사용)")
+    ap.add_argument("--workers", default="", help="e2e 워커 수 목록, 예: 1,2,4 (기본: 1,2,4,…,코어 수)")
+    ap.add_argument("--repeat", type=int, default=3, help="micro 반복 횟수")
+    ap.add_argument("--micro-files", type=int, default=6, help="micro에 쓸 파일 수")
+    ap.add_argument("--skip-micro", action="store_true")
+    ap.add_argument("--skip-e2e", action="store_true")
+    ap.add_argument("--out", type=Path, default=Path("bench_results"), help="결과 JSON 파일 또는 디렉터리")
+    ap.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "NEW"), help="두 결과 JSON 비교만 수행")
+    args = ap.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare); return 0
+
+    spec = PRESETS[args.preset]
+    print(f"corpus: {args.corpus / args.preset}", file=sys.stderr)
+    roots = make_corpus(args.corpus / args.preset, spec)
+    settings = AppSettings(sizes=list(DEFAULT_SIZES), default_wm_text="Bench ㈜하이브랩")
+
+    if args.workers:
+        workers_list = [int(v) for v in args.workers.split(",") if v.strip()]
+    else:
+        cpu = os.cpu_count() or 1
+        workers_list = sorted({1, *[n for n in (2, 4, 8, 16) if n < cpu], cpu})
+
+    result = {
+        "meta": {
+            "commit": _git_rev(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "preset": args.preset,
+            "corpus": spec.__dict__,
+            "sizes": settings.sizes,
+        }
+    }
+    with tempfile.TemporaryDirectory(prefix="wm_bench_") as td:
+        tmp = Path(td)
+        if not args.skip_micro:
+            files = sorted(p for rc in roots for p in rc.path.rglob("*") if p.suffix in (".jpg", ".png", ".webp"))
+            result["micro"] = bench_micro(files[: args.micro_files], settings, args.repeat, tmp)
+        if not args.skip_e2e:
+            result["e2e"] = bench_e2e(roots, settings, workers_list, tmp)
+
+    out = args.out
+    if out.suffix.lower() != ".json":
+        out = out / f"bench_{result['meta']['commit']}_{args.preset}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(out)
+    return 0
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
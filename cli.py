@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""헤드리스 배치 실행(서버/cron용). tkinter를 import하지 않는다.
+
+    python -m cli --root D:/posts "㈜하이브랩" --root E:/more --size 1080x1350 --output D:/export
+    python -m cli --config job.json
+    python -m cli --config job.json --watch      # 초기 배치 후 새로 들어오는 게시물을 계속 처리
+
+진행 상황은 stdout에 JSON Lines로 흘린다.
+  {"event": "start", "posts": 12, "total": 108}
+  {"event": "progress", "done": 1, "total": 108}
+  {"event": "error", "message": "..."}
+  {"event": "done", "processed": 100, "skipped": 8, "errors": 0, "elapsed": 12.3}
+  {"event": "watch", "mode": "events"}                               # --watch
+  {"event": "watch_batch", "posts": ["rootA/post3"], "total": 6}    # 이후 progress/error/done 반복
+"""
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from settings import AppSettings, RootConfig, hex_to_rgb, load_config, parse_size, parse_target_kb
+from controller import AppController, REPORT_NAME
+from services.writer import OUTPUT_PROFILES, get_profile
+
+def _emit(obj: dict, _lock=threading.Lock()):
+    line = json.dumps(obj, ensure_ascii=False)
+    with _lock:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m cli", description="Post watermark & resize (headless)")
+    p.add_argument("--config", type=Path, help="JSON/INI 설정 파일(명령행 인자가 우선)")
+    p.add_argument("--root", action="append", nargs="+", metavar=("PATH", "WM_TEXT"), default=[],
+                   help="입력 루트와 (선택) 루트별 워터마크 텍스트. 여러 번 지정 가능")
+    p.add_argument("--size", action="append", default=[], metavar="WxH", help="출력 규격. 여러 번 지정 가능")
+    p.add_argument("--format", choices=sorted(OUTPUT_PROFILES), help="출력 형식(기본 jpeg-optimized)")
+    p.add_argument("--effort", type=int, help="WebP 인코더 노력 0(빠름)-6(작음)")
+    p.add_argument("--dedup", choices=["off", "link", "copy"],
+                   help="내용이 같은 원본은 한 번만 렌더하고 나머지는 하드링크/복사")
+    p.add_argument("--target-kb", action="append", default=[], metavar="[WxH=]KB",
+                   help="출력 용량 상한(KB). 규격 생략 시 전 규격. 여러 번 지정 가능")
+    p.add_argument("--output", type=Path, help="출력 루트(기본: <첫 루트>/export)")
+    p.add_argument("--workers", type=int, help="워커 프로세스 수(기본: 코어-1)")
+    p.add_argument("--bg", help="배경색 #RRGGBB")
+    p.add_argument("--opacity", type=int, help="워터마크 불투명도 0-100")
+    p.add_argument("--scale", type=int, help="워터마크 크기(짧은 변 대비 %%)")
+    p.add_argument("--fill", help="글자색 #RRGGBB")
+    p.add_argument("--stroke", help="외곽선색 #RRGGBB")
+    p.add_argument("--stroke-width", type=int)
+    p.add_argument("--anchor", metavar="X,Y", help="정규화 위치(0~1), 예: 0.5,0.9")
+    p.add_argument("--font", type=Path, help="TTF/OTF 폰트 파일")
+    p.add_argument("--default-text", help="루트별 텍스트가 없을 때 쓸 워터마크 텍스트")
+    p.add_argument("--prefetch-mb", type=int, help="원본 미리 읽기 버퍼 상한(MB), 0이면 끔")
+    p.add_argument("--fsync-group", type=int, help="출력 N개씩 모아 fsync(기본 0: 안 함)")
+    p.add_argument("--profile", action="store_true", help="단계별 계측 후 <output>/run_report.json 작성")
+    p.add_argument("--watch", action="store_true", help="초기 배치 후 종료하지 않고 입력 루트를 감시")
+    p.add_argument("--settle", type=float, default=5.0, help="감시: 폴더가 이 시간(초) 동안 그대로면 처리")
+    p.add_argument("--poll", type=float, default=2.0, help="감시: 점검 주기(초)")
+    return p
+
+def resolve(args) -> tuple[AppSettings, List[RootConfig]]:
+    try:
+        settings, roots = load_config(args.config) if args.config else (AppSettings(), [])
+    except ValueError as e:
+        raise SystemExit(f"{args.config}: {e}")
+    if args.default_text: settings.default_wm_text = args.default_text
+    if args.root:
+        roots = []
+        for vals in args.root:
+            if len(vals) > 2:
+                raise SystemExit(f"--root takes PATH [WM_TEXT], got {vals}")
+            text = vals[1] if len(vals) == 2 else settings.default_wm_text
+            roots.append(RootConfig(path=Path(vals[0]), wm_text=text))
+    if args.size: settings.sizes = [parse_size(v) for v in args.size]
+    if args.format: settings.output_profile = args.format
+    if args.effort is not None: settings.output_effort = args.effort
+    try:
+        get_profile(settings.output_profile)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if args.dedup: settings.dedup = args.dedup
+    if args.target_kb: settings.target_kb = dict(parse_target_kb(v) for v in args.target_kb)
+    if args.output: settings.output_root = args.output
+    if args.workers: settings.workers = args.workers
+    if args.bg: settings.bg_color = hex_to_rgb(args.bg)
+    if args.opacity is not None: settings.wm_opacity = args.opacity
+    if args.scale is not None: settings.wm_scale_pct = args.scale
+    if args.fill: settings.wm_fill_color = hex_to_rgb(args.fill)
+    if args.stroke: settings.wm_stroke_color = hex_to_rgb(args.stroke)
+    if args.stroke_width is not None: settings.wm_stroke_width = args.stroke_width
+    if args.anchor:
+        x, y = args.anchor.split(",")
+        settings.wm_anchor = (float(x), float(y))
+    if args.font: settings.wm_font_path = args.font
+    if args.prefetch_mb is not None: settings.prefetch_mb = args.prefetch_mb
+    if args.fsync_group is not None: settings.fsync_group = args.fsync_group
+    if args.profile: settings.profile = True
+    if not str(settings.output_root) or str(settings.output_root) == ".":
+        settings.output_root = (roots[0].path / "export") if roots else Path("export")
+    return settings, roots
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    settings, roots = resolve(args)
+    if not roots:
+        _emit({"event": "error", "message": "no input roots (use --root or --config)"})
+        return 2
+
+    controller = AppController()
+    if not args.watch:
+        errors = _run(controller, settings, controller.scan_posts_multi(roots), "start")
+        return 1 if errors else 0
+
+    # 감시는 첫 스캔 '전에' 시작: 초기 배치(길면 몇 시간) 동안 올라온 파일도 변경분으로 잡힌다.
+    # 첫 배치와 겹쳐 잡힌 파일은 다음 배치에서 매니페스트로 건너뛴다.
+    from workers.watcher import PostWatcher
+    batches: "queue.Queue[dict]" = queue.Queue()
+    watcher = PostWatcher(roots, batches.put, settle_s=args.settle, poll_s=args.poll)
+    watcher.prime()
+    stop = threading.Event()
+    t = threading.Thread(target=watcher.run, args=(stop,), daemon=True)
+    t.start()
+    try:
+        _run(controller, settings, controller.scan_posts_multi(roots), "start")
+        _emit({"event": "watch", "mode": "events" if watcher.use_events else "polling"})
+        while True:
+            try:
+                ready = batches.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            _run(controller, settings, ready, "watch_batch")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set(); t.join(timeout=args.poll + 5)
+    return 0
+
+def _run(controller: AppController, settings: AppSettings, posts: dict, event: str) -> int:
+    """배치 1회 실행 + JSONL 이벤트. 오류 개수 반환."""
+    total = sum(len(meta["files"]) for meta in posts.values()) * len(settings.sizes)
+    head = {"event": event, "posts": len(posts) if event == "start" else sorted(posts), "total": total}
+    if event == "start":
+        head.update(output_root=str(settings.output_root), workers=settings.workers)
+    _emit(head)
+
+    t0 = time.perf_counter()
+    errors = 0
+    summary = {}
+
+    def on_progress(done: int):
+        _emit({"event": "progress", "done": done, "total": total})
+    def on_done(processed: int, skipped: int):
+        summary.update(processed=processed, skipped=skipped)
+    def on_error(msg: str):
+        nonlocal errors
+        errors += 1
+        _emit({"event": "error", "message": msg})
+
+    controller.run_batch(settings, posts, on_progress, on_done, on_error)
+    done = {"event": "done", "processed": summary.get("processed", 0), "skipped": summary.get("skipped", 0),
+            "errors": errors, "elapsed": round(time.perf_counter() - t0, 3)}
+    if settings.profile:
+        done["report"] = str(settings.output_root / REPORT_NAME)
+    _emit(done)
+    return errors
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,38 +1,94 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-from pathlib import Path
-from typing import Dict, List, Tuple, Callable
+import threading
+from typing import Dict, List, Callable
 from PIL import Image
 
-from settings import AppSettings, RootConfig
-from services.discovery import scan_posts
-from services.image_ops import load_image
+from settings import AppSettings, RootConfig, default_cache_dir
+from services.dedup import HashCache, check_dedup_mode, hash_sources
+from services.discovery import ScanCache, scan_roots
+from services.image_ops import load_image, max_target_box
 from services.resize import resize_contain
 from services.watermark import add_text_watermark
-from services.writer import save_jpeg
+from services.manifest import Manifest
+from services.metrics import RunReport
+from services.preview_cache import PreviewCache
+from services.planner import Job, Output, build_plan
+from services.writer import ensure_dirs
+from workers.job_runner import JobRunner, RunControl
+
+REPORT_NAME = "run_report.json"
+PREVIEW_BOX = (1920, 1920)  # 미리보기 '원본' 표시에 필요한 해상도 상한(화면 크기 수준)
+HASH_CACHE_NAME = "hash_cache.json"
 
 class AppController:
     def __init__(self):
         self._processed = 0
+        self._control: RunControl | None = None
+        self._running = False
+        self._scan_cache: ScanCache | None = None
+        self._preview_cache = PreviewCache()
+
+    # -------- 실행 제어(어느 스레드에서 호출해도 됨) --------
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self._control and self._control.cancelled)
+
+    @property
+    def paused(self) -> bool:
+        return bool(self._control and self._control.paused)
+
+    def cancel_batch(self):
+        if self._control: self._control.cancel()
+
+    def pause_batch(self):
+        if self._control: self._control.pause()
+
+    def resume_batch(self):
+        if self._control: self._control.resume()
 
     def scan_posts_multi(self, roots: List[RootConfig]) -> Dict[str, dict]:
+        if self._scan_cache is None:
+            self._scan_cache = ScanCache.load(default_cache_dir() / "scan_cache.json")
+        scanned = scan_roots([rc.path for rc in roots], self._scan_cache)
+        self._scan_cache.save()
         posts: Dict[str, dict] = {}
-        for rc in roots:
+        for rc, sub in zip(roots, scanned):
             root = rc.path
-            sub = scan_posts(root)
             for post_name, files in sub.items():
                 key = f"{root.name}/{post_name}"
                 posts[key] = {"root": rc, "post_name": post_name, "files": files}
         return posts
 
     def preview_by_key(self, key: str, posts: Dict[str, dict], settings: AppSettings) -> tuple[Image.Image, Image.Image]:
+        """(원본, 워터마크 결과). 디코드 원본은 (경로, mtime, 크기), 맞춤 캔버스는 거기에 (규격, 배경색)을
+        더한 키로 캐시해, 워터마크 옵션만 바뀌면 캐시된 캔버스에 다시 합성만 한다. 워커 스레드에서 불러도 됨."""
         meta = posts.get(key)
         if not meta or not meta["files"]:
             raise ValueError("No images in this post.")
         src = meta["files"][0]
-        before = load_image(src).convert("RGB")
+        st = src.stat()
+        target = tuple(settings.sizes[0])
+        skey = (str(src), st.st_mtime_ns, st.st_size)
+        ckey = skey + (target, tuple(settings.bg_color))
+        hit = self._preview_cache.get(skey)
+        if hit is None:
+            # 화면 표시와 캔버스에 충분한 해상도까지만 디코드
+            before = load_image(src, max_target_box([target, PREVIEW_BOX])).convert("RGB")
+            self._preview_cache.put(skey, (before,))
+        else:
+            before, = hit
+        hit = self._preview_cache.get(ckey)
+        if hit is None:
+            canvas = resize_contain(before, target, settings.bg_color, before.info.get("source_size"))
+            self._preview_cache.put(ckey, (canvas,))
+        else:
+            canvas, = hit
 
-        canvas = resize_contain(before, settings.sizes[0], settings.bg_color)
         wm_text = (meta["root"].wm_text or "").strip() or settings.default_wm_text
         after = add_text_watermark(
             canvas,
@@ -52,48 +108,85 @@ class AppController:
         settings: AppSettings,
         posts: Dict[str, dict],
         progress_cb: Callable[[int], None],
-        done_cb: Callable[[int], None],
+        done_cb: Callable[[int, int], None],
+        error_cb: Callable[[str], None] | None = None,
+        fail_cb: Callable[[str], None] | None = None,
+    ):
+        """run_batch를 데몬 스레드에서 실행(UI용).
+        RunControl은 여기서 만든다 → Start 직후 누른 Stop/Pause도 이번 배치에 걸린다."""
+        self._running = True
+        control = self._control = RunControl()
+        t = threading.Thread(target=self.run_batch, args=(settings, posts, progress_cb, done_cb, error_cb, fail_cb, control),
+                             daemon=True)
+        t.start()
+        return t
+
+    def run_batch(
+        self,
+        settings: AppSettings,
+        posts: Dict[str, dict],
+        progress_cb: Callable[[int], None],
+        done_cb: Callable[[int, int], None],
         error_cb: Callable[[str], None] | None = None,
+        fail_cb: Callable[[str], None] | None = None,
+        control: RunControl | None = None,
     ):
-        import threading
-        total = sum(len(meta["files"]) for meta in posts.values()) * len(settings.sizes)
+        """배치를 동기 실행. done_cb(processed, skipped): 이번에 처리한 수와 매니페스트로 건너뛴 수.
+        배치 자체가 실패하면(출력 폴더 생성 불가, 프로세스 풀 붕괴 등) done_cb 대신 fail_cb(message)가
+        불린다(없으면 error_cb). 둘 중 하나는 반드시 불린다.
+        완료분은 매니페스트 저널에 즉시 기록되므로(체크포인트), 취소/크래시 후 다시 돌리면 미완료분만 처리한다."""
         self._processed = 0
+        control = self._control = control or RunControl()
+        self._running = True
+        try:
+            report = RunReport() if settings.profile else None
+            errors = 0
+            manifest = Manifest.load(settings.output_root)
+            hashes = None
+            if check_dedup_mode(settings.dedup) != "off":
+                hashes = hash_sources((src for meta in posts.values() for src in meta["files"]),
+                                      HashCache.load(default_cache_dir() / HASH_CACHE_NAME),
+                                      cancelled=lambda: control.cancelled)
+            plan = build_plan(posts, settings, manifest, hashes) if not control.cancelled else None
+            if plan is None or control.cancelled:
+                # 해시/계획 단계에서 취소됨 → 아무것도 쓰지 않고 끝
+                if done_cb: done_cb(0, 0)
+                return
+            ensure_dirs(o.dst.parent for job in plan.jobs for out in job.outputs for o in (out, *out.dups))
+            # 스킵분은 바로 진행률에 반영
+            self._processed = plan.skipped
+            if plan.skipped and progress_cb: progress_cb(self._processed)
+
+            lock = threading.Lock()
+
+            def on_result(job: Job, out: Output, err: BaseException | None):
+                # writer 스레드에서 불림(파일 쓰기 완료 시점)
+                nonlocal errors
+                if err is None:
+                    manifest.record(out.dst, out.key)
+                else:
+                    with lock:
+                        errors += 1
+                    if error_cb:
+                        w, h = out.size
+                        error_cb(f"{out.src or job.src} {w}x{h}: {err}")
+                with lock:
+                    self._processed += 1
+                    done = self._processed
+                if progress_cb: progress_cb(done)
 
-        def worker():
             try:
-                for key, meta in posts.items():
-                    post = meta["post_name"]
-                    rc: RootConfig = meta["root"]
-                    wm_text = (rc.wm_text or "").strip() or settings.default_wm_text
-                    for src in meta["files"]:
-                        for (w, h) in settings.sizes:
-                            try:
-                                img = self._process_image(src, (w, h), settings, wm_text)
-                                dst = settings.output_root / post / f"{w}x{h}" / (src.stem + "_wm.jpg")
-                                save_jpeg(img, dst)
-                            except Exception as e:
-                                if error_cb: error_cb(f"{src} {w}x{h}: {e}")
-                            finally:
-                                self._processed += 1
-                                if progress_cb: progress_cb(self._processed)
-                if done_cb: done_cb(self._processed)
-            except Exception as e:
-                if error_cb: error_cb(str(e))
-
-        threading.Thread(target=worker, daemon=True).start()
-
-    def _process_image(self, src: Path, target: Tuple[int, int], settings: AppSettings, wm_text: str) -> Image.Image:
-        im = load_image(src)
-        canvas = resize_contain(im, target, settings.bg_color)
-        out = add_text_watermark(
-            canvas,
-            text=wm_text,
-            opacity_pct=settings.wm_opacity,
-            scale_pct=settings.wm_scale_pct,
-            fill_rgb=settings.wm_fill_color,
-            stroke_rgb=settings.wm_stroke_color,
-            stroke_width=settings.wm_stroke_width,
-            anchor_norm=settings.wm_anchor,
-            font_path=settings.wm_font_path,  # 🔹 폰트 전달
-        )
-        return out
+                JobRunner(settings, control=control).run(
+                    plan.jobs, on_result, (lambda job, m: report.add(job.src, m)) if report else None)
+            finally:
+                manifest.save()
+            if report:
+                report.write(settings.output_root / REPORT_NAME, processed=self._processed - plan.skipped,
+                             skipped=plan.skipped, errors=errors, workers=settings.workers,
+                             deduped=plan.deduped)
+            if done_cb: done_cb(self._processed - plan.skipped, plan.skipped)
+        except Exception as e:
+            if fail_cb: fail_cb(str(e))
+            elif error_cb: error_cb(str(e))
+        finally:
+            self._running = False
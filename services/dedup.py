@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import hashlib
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from services.json_cache import JsonCache
+from services.writer import tmp_path
+
+HASH_WORKERS = 8          # 해시는 I/O 대기가 대부분 + hashlib이 GIL을 놓으므로 스레드로 충분
+HASH_CHUNK = 1 << 20      # 스트리밍 읽기 단위(파일 전체를 메모리에 올리지 않음)
+DEDUP_MODES = ("off", "link", "copy")
+
+def check_dedup_mode(mode: str) -> str:
+    """설정값 → 'off' | 'link' | 'copy'. 모르는 값이면 ValueError(오타로 하드링크가 켜지지 않도록)."""
+    m = str(mode).strip().lower()
+    if m not in DEDUP_MODES:
+        raise ValueError(f"unknown dedup mode: {mode} (choose from {', '.join(DEDUP_MODES)})")
+    return m
+
+def hash_file(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class HashCache(JsonCache):
+    """원본 내용 해시 캐시. 경로의 (size, mtime_ns)가 같으면 다시 읽지 않는다."""
+    VERSION = 1
+    SECTION = "files"
+
+    @staticmethod
+    def _decode(v) -> Tuple[int, int, str]:
+        return int(v[0]), int(v[1]), str(v[2])
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Optional[str]:
+        hit = self._entries.get(path)
+        return hit[2] if hit and hit[0] == size and hit[1] == mtime_ns else None
+
+    def put(self, path: str, size: int, mtime_ns: int, digest: str):
+        self._set(path, (size, mtime_ns, digest))
+
+def hash_sources(paths: Iterable[Path], cache: Optional[HashCache] = None, max_workers: int = HASH_WORKERS,
+                  cancelled: Optional[Callable[[], bool]] = None) -> Dict[Path, str]:
+    """원본 경로 → 내용 해시. 읽을 수 없는 파일은 빠진다(중복 제거 대상에서 제외).
+    cancelled()가 참이 되면 남은 파일은 읽지 않고 건너뛴다(그때까지 계산한 해시는 캐시에 남김)."""
+    cache = cache or HashCache()
+
+    def one(p: Path) -> Tuple[Path, Optional[str]]:
+        if cancelled and cancelled():
+            return p, None
+        try:
+            st = os.stat(p)
+            digest = cache.get(str(p), st.st_size, st.st_mtime_ns)
+            if digest is None:
+                digest = hash_file(p)
+                cache.put(str(p), st.st_size, st.st_mtime_ns, digest)
+            return p, digest
+        except OSError:
+            return p, None
+
+    paths = list(dict.fromkeys(paths))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="hash") as ex:
+        out = {p: d for p, d in ex.map(one, paths) if d is not None}
+    cache.save()
+    return out
+
+def link_or_copy(src: Path, dst: Path, copy: bool = False):
+    """이미 쓴 출력 src를 dst로 실체화(하드링크, 안 되면 복사). 임시이름 → rename으로 원자적."""
+    if Path(src) == Path(dst):
+        return
+    tmp = tmp_path(dst)
+    try:
+        tmp.unlink()
+    except FileNotFoundError:
+        pass
+    if copy:
+        shutil.copyfile(src, tmp)
+    else:
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)  # 다른 볼륨/하드링크 미지원 FS
+    os.replace(tmp, dst)
@@ -1,7 +1,15 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from services.json_cache import JsonCache
 
 SUPPORTED_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
 
+# 게시물 폴더 나열에 쓰는 스레드 수(NAS 왕복 지연을 겹치기 위한 I/O 병렬)
+SCAN_WORKERS = 16
+
 def is_image(p: Path) -> bool:
     return p.is_file() and p.suffix.lower() in SUPPORTED_EXTS
 
@@ -11,13 +19,84 @@ def numeric_key(p: Path):
     except Exception:
         return (1, p.name.lower())
 
-def scan_posts(input_root: Path):
-    posts = {}
+class ScanCache(JsonCache):
+    """게시물 폴더별 이미지 목록 캐시. 폴더 mtime이 같으면 다시 나열하지 않는다.
+    (폴더 mtime은 항목 추가/삭제/이름변경 시 바뀐다)"""
+    VERSION = 1
+    SECTION = "dirs"
+
+    @staticmethod
+    def _decode(v) -> Tuple[int, List[str]]:
+        return int(v[0]), list(v[1])
+
+    def get(self, dir_path: str, mtime_ns: int) -> Optional[List[str]]:
+        hit = self._entries.get(dir_path)
+        return hit[1] if hit and hit[0] == mtime_ns else None
+
+    def put(self, dir_path: str, mtime_ns: int, names: List[str]):
+        self._set(dir_path, (mtime_ns, names))
+
+def list_post_dirs(input_root: Path) -> List[Tuple[str, str, int]]:
+    """(이름, 경로, mtime_ns) — scandir의 d_type으로 디렉터리 판별."""
+    out = []
+    try:
+        with os.scandir(input_root) as it:
+            for e in it:
+                try:
+                    if e.is_dir():
+                        out.append((e.name, e.path, e.stat().st_mtime_ns))
+                except OSError:
+                    continue
+    except OSError:
+        return []
+    out.sort(key=lambda t: t[0].lower())
+    return out
+
+def list_images(dir_path: str, mtime_ns: int = 0, cache: Optional[ScanCache] = None) -> List[Path]:
+    """게시물 폴더의 이미지(숫자 우선 정렬). cache가 있으면 mtime이 같을 때 재사용."""
+    names = cache.get(dir_path, mtime_ns) if cache else None
+    if names is None:
+        found = []
+        try:
+            with os.scandir(dir_path) as it:
+                for e in it:
+                    if os.path.splitext(e.name)[1].lower() not in SUPPORTED_EXTS:
+                        continue
+                    try:
+                        if e.is_file():
+                            found.append(Path(e.path))
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        found.sort(key=numeric_key)
+        names = [p.name for p in found]
+        if cache:
+            cache.put(dir_path, mtime_ns, names)
+        return found
+    base = Path(dir_path)
+    return [base / n for n in names]
+
+def scan_roots(input_roots: List[Path], cache: Optional[ScanCache] = None, max_workers: int = SCAN_WORKERS) -> List[Dict[str, List[Path]]]:
+    """여러 루트를 한 스레드 풀로 동시에 스캔. 결과는 input_roots 순서대로 {게시물: [이미지]}."""
+    roots = [r if r and Path(r).exists() else None for r in input_roots]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        listings = list(pool.map(lambda r: list_post_dirs(r) if r else [], roots))
+        futures = [
+            [(name, pool.submit(list_images, path, mtime, cache)) for name, path, mtime in dirs]
+            for dirs in listings
+        ]
+        results = []
+        for per_root in futures:
+            posts = {}
+            for name, fut in per_root:
+                imgs = fut.result()
+                if imgs:
+                    posts[name] = imgs
+            results.append(posts)
+    return results
+
+def scan_posts(input_root: Path, cache: Optional[ScanCache] = None):
     if not input_root or not input_root.exists():
-        return posts
-    for child in sorted(input_root.iterdir(), key=lambda p: p.name.lower()):
-        if child.is_dir():
-            imgs = [p for p in sorted(child.iterdir(), key=numeric_key) if is_image(p)]
-            if imgs:
-                posts[child.name] = imgs
-    return posts
+        return {}
+    return scan_roots([input_root], cache)[0]
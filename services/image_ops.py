@@ -1,5 +1,13 @@
-from PIL import Image, ImageOps
+import io
+import math
+from PIL import Image, ImageOps, UnidentifiedImageError
 from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+# 축소 디코드 시 목표 박스 대비 최소 배율(LANCZOS가 쓸 표본 여유)
+DECODE_OVERSAMPLE = 2.0
+
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}  # 90/270도 회전 → 가로/세로 뒤바뀜
 
 def exif_transpose(image: Image.Image) -> Image.Image:
     try:
@@ -7,9 +15,54 @@ def exif_transpose(image: Image.Image) -> Image.Image:
     except Exception:
         return image
 
-def load_image(path: Path) -> Image.Image:
-    im = Image.open(str(path))
+def max_target_box(sizes: Iterable[Tuple[int, int]]) -> Tuple[int, int]:
+    """여러 규격을 모두 덮는 박스. Contain 기준으로 이 박스의 배율이 각 규격 배율 이상이다."""
+    sizes = list(sizes)
+    return max(w for w, _ in sizes), max(h for _, h in sizes)
+
+def _oriented_size(im: Image.Image) -> Tuple[int, int]:
+    """EXIF 회전을 반영한 원본 크기(디코드 전 헤더 기준)."""
+    W, H = im.size
+    try:
+        if im.getexif().get(0x0112, 1) in _ROTATED_ORIENTATIONS:
+            return H, W
+    except Exception:
+        pass
+    return W, H
+
+def _decode_scale(src_size: Tuple[int, int], max_box: Tuple[int, int]) -> float:
+    """원본 대비 필요한 최소 배율(1.0이면 축소 불가)."""
+    W, H = src_size
+    return min(1.0, DECODE_OVERSAMPLE * min(max_box[0] / W, max_box[1] / H))
+
+def load_image(path: Path, max_box: Optional[Tuple[int, int]] = None, data: Optional[bytes] = None) -> Image.Image:
+    """max_box가 주어지면 그 박스를 Contain으로 채우는 데 충분한 해상도까지만 디코드한다.
+    - JPEG: draft()로 DCT 단계에서 1/2, 1/4, 1/8 축소
+    - 그 외: 디코드 후 reduce()로 정수배 축소
+    축소 여부와 무관하게 원본(회전 반영) 크기를 info["source_size"]에 남긴다.
+    축소 디코드 결과의 반올림 때문에 출력 배치가 1px 어긋나지 않도록 resize_contain이 이 값을 쓴다.
+    data가 있으면(미리 읽은 파일 바이트) 디스크 대신 메모리에서 디코드한다.
+    """
+    if data is not None:
+        try:
+            im = Image.open(io.BytesIO(data))
+        except UnidentifiedImageError:
+            raise UnidentifiedImageError(f"cannot identify image file {str(path)!r}") from None
+    else:
+        im = Image.open(str(path))
+    source_size = _oriented_size(im)
+    scale = _decode_scale(source_size, max_box) if max_box else 1.0
+    drafted = False
+    if scale < 1.0 and im.format == "JPEG":
+        W, H = im.size
+        im.draft("RGB", (math.ceil(W * scale), math.ceil(H * scale)))
+        drafted = True
     im = exif_transpose(im)
     if im.mode not in ("RGB", "RGBA"):
         im = im.convert("RGBA" if im.mode == "LA" else "RGB")
+    if scale < 1.0 and not drafted:
+        factor = int(1.0 / scale)
+        if factor >= 2:
+            im = im.reduce(factor)
+    im.info["source_size"] = source_size
     return im
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from services.writer import write_atomic
+
+class JsonCache:
+    """키 → 값 JSON 파일 캐시(스캔 목록/해시 캐시의 공통 부분).
+    하위 클래스는 VERSION, SECTION(JSON 안의 키 이름), _decode(값)만 정한다.
+    put은 여러 스레드에서 불러도 되고, save()는 바뀐 게 있을 때만 임시파일 → rename으로 쓴다."""
+    VERSION = 1
+    SECTION = "entries"
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path):
+        c = cls(path)
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            if data.get("version") == cls.VERSION:
+                c._entries = {k: cls._decode(v) for k, v in data[cls.SECTION].items()}
+        except Exception:
+            pass  # 없거나 깨진 캐시 → 빈 캐시로 시작
+        return c
+
+    @staticmethod
+    def _decode(value) -> Any:
+        return value
+
+    def _set(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = json.dumps({"version": self.VERSION, self.SECTION: self._entries}, ensure_ascii=False)
+            try:
+                write_atomic(data.encode("utf-8"), self.path)
+                self._dirty = False
+            except OSError:
+                pass  # 캐시는 없어도 동작에 지장 없음
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict
+
+MANIFEST_NAME = ".manifest.json"
+JOURNAL_NAME = ".manifest.journal"  # 완료 건마다 한 줄씩 추가(크래시 대비)
+
+class Manifest:
+    """출력 루트의 작업 기록. {출력 상대경로: 멱등성 키}.
+    - record(): 작업 하나가 끝날 때마다 저널에 한 줄 append(+flush) → 중간에 죽어도 완료분은 남는다.
+    - save(): 저널을 합쳐 .manifest.json을 임시파일+rename으로 원자적으로 교체.
+    """
+    def __init__(self, output_root: Path):
+        self.root = Path(output_root)
+        self.path = self.root / MANIFEST_NAME
+        self.journal_path = self.root / JOURNAL_NAME
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._journal = None
+
+    @classmethod
+    def load(cls, output_root: Path) -> "Manifest":
+        m = cls(output_root)
+        try:
+            data = json.loads(m.path.read_text(encoding="utf-8"))
+            m._entries.update(data.get("entries", {}))
+        except Exception:
+            pass
+        try:
+            with open(m.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                        m._entries[rec["dst"]] = rec["key"]
+                    except Exception:
+                        continue  # 쓰다 만 마지막 줄 등은 무시
+        except FileNotFoundError:
+            pass
+        return m
+
+    def _rel(self, dst: Path) -> str:
+        try:
+            return Path(dst).relative_to(self.root).as_posix()
+        except ValueError:
+            return Path(dst).as_posix()
+
+    def is_done(self, dst: Path, key: str) -> bool:
+        return self._entries.get(self._rel(dst)) == key and Path(dst).exists()
+
+    def record(self, dst: Path, key: str):
+        rel = self._rel(dst)
+        line = json.dumps({"dst": rel, "key": key}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._entries[rel] = key
+            if self._journal is None:
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal.write(line)
+            self._journal.flush()
+
+    def save(self):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close(); self._journal = None
+            if not self._entries:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps({"entries": self._entries}, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+            try:
+                self.journal_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __len__(self):
+        return len(self._entries)
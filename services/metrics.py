@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+STAGES = ("decode", "resize", "watermark", "encode", "write")
+
+class StageTimer:
+    """작업 하나의 단계별 벽시계/CPU 시간과 바이트 수.
+    CPU 시간은 thread_time 기준(프로세스 풀 워커/인라인 스레드 모두 해당 작업만 잡힘)."""
+    enabled = True
+
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}  # name -> [wall, cpu, bytes]
+        self.info: Dict[str, object] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        w0 = time.perf_counter(); c0 = time.thread_time()
+        try:
+            yield
+        finally:
+            rec = self.stages.setdefault(name, [0.0, 0.0, 0])
+            rec[0] += time.perf_counter() - w0
+            rec[1] += time.thread_time() - c0
+
+    def add_bytes(self, name: str, n: int):
+        self.stages.setdefault(name, [0.0, 0.0, 0])[2] += int(n)
+
+    def add_time(self, name: str, wall: float, cpu: float = 0.0):
+        rec = self.stages.setdefault(name, [0.0, 0.0, 0])
+        rec[0] += wall; rec[1] += cpu
+
+    def to_dict(self) -> dict:
+        return {"stages": self.stages, **self.info}
+
+
+class _NullTimer:
+    """계측 꺼짐: 핫패스에서 분기 없이 쓰도록 같은 인터페이스의 no-op."""
+    enabled = False
+    info: Dict[str, object] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        yield
+
+    def add_bytes(self, name: str, n: int):
+        pass
+
+    def add_time(self, name: str, wall: float, cpu: float = 0.0):
+        pass
+
+NULL_TIMER = _NullTimer()
+
+
+def _pct(sorted_vals: List[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    i = min(len(sorted_vals) - 1, max(0, int(round(p / 100.0 * (len(sorted_vals) - 1)))))
+    return sorted_vals[i]
+
+def _summary(vals: List[float]) -> dict:
+    s = sorted(vals)
+    return {
+        "count": len(s),
+        "total": round(sum(s), 6),
+        "p50": round(_pct(s, 50), 6),
+        "p95": round(_pct(s, 95), 6),
+        "max": round(s[-1], 6) if s else 0.0,
+    }
+
+
+class RunReport:
+    """부모 프로세스에서 작업별 계측을 모아 요약 리포트(JSON)를 만든다.
+    같은 원본의 계측이 여러 번 오면(워커의 렌더 단계 + writer 스레드의 write 단계) 원본 하나로 합친다."""
+    SLOWEST = 10
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._jobs: List[dict] = []
+        self._by_src: Dict[str, dict] = {}
+        self._lock = threading.Lock()  # 러너 스레드와 writer 스레드가 함께 부른다
+
+    def add(self, src: Path, metrics: Optional[dict]):
+        if not metrics:
+            return
+        with self._lock:
+            job = self._by_src.get(str(src))
+            if job is None:
+                job = self._by_src[str(src)] = {"src": str(src), "stages": {}}
+                self._jobs.append(job)
+            for name, rec in metrics.get("stages", {}).items():
+                acc = job["stages"].setdefault(name, [0.0, 0.0, 0])
+                acc[0] += rec[0]; acc[1] += rec[1]; acc[2] += rec[2]
+            job.update((k, v) for k, v in metrics.items() if k != "stages")
+
+    def build(self, processed: int, skipped: int, errors: int, workers: int, deduped: int = 0) -> dict:
+        elapsed = time.perf_counter() - self._t0
+        stages: Dict[str, dict] = {}
+        names = list(STAGES) + sorted({n for j in self._jobs for n in j["stages"]} - set(STAGES))
+        for name in names:
+            recs = [j["stages"][name] for j in self._jobs if name in j["stages"]]
+            if not recs:
+                continue
+            stages[name] = {
+                "wall": _summary([r[0] for r in recs]),
+                "cpu": _summary([r[1] for r in recs]),
+                "bytes": int(sum(r[2] for r in recs)),
+            }
+        for j in self._jobs:
+            j["wall"] = sum(r[0] for r in j["stages"].values())
+        slowest = sorted(self._jobs, key=lambda j: j["wall"], reverse=True)[: self.SLOWEST]
+        mp_decoded = sum(j.get("mp_decoded", 0.0) for j in self._jobs)
+        mp_out = sum(j.get("mp_out", 0.0) for j in self._jobs)
+        per = max(elapsed, 1e-9)
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "workers": workers,
+            "sources": len(self._jobs),
+            "sources_prefetched": sum(1 for j in self._jobs if j.get("prefetched")),
+            "outputs_processed": processed,
+            "outputs_skipped": skipped,
+            "outputs_deduped": deduped,  # processed 중 렌더 없이 링크/복사한 수
+            "errors": errors,
+            "throughput": {
+                "sources_per_s": round(len(self._jobs) / per, 3),
+                "images_per_s": round(processed / per, 3),
+                "mp_decoded_per_s": round(mp_decoded / per, 3),
+                "mp_out_per_s": round(mp_out / per, 3),
+            },
+            # 설계 8) 평균 처리시간: 원본 1장(모든 규격) 기준
+            "avg_job_wall_s": round(sum(j["wall"] for j in self._jobs) / len(self._jobs), 6) if self._jobs else 0.0,
+            "stages": stages,
+            "quality": self._quality(),
+            "slowest": [
+                {"src": j["src"], "wall_s": round(j["wall"], 6),
+                 "stages": {k: round(v[0], 6) for k, v in j["stages"].items()}}
+                for j in slowest
+            ],
+        }
+
+    def _quality(self) -> dict:
+        """용량 맞추기 모드에서 규격별로 고른 JPEG 품질 분포와 상한 초과 수."""
+        per: Dict[str, List[list]] = {}
+        for j in self._jobs:
+            for size, rec in j.get("quality", {}).items():
+                per.setdefault(size, []).append(rec)
+        out = {}
+        for size, recs in sorted(per.items()):
+            qs = sorted(r[0] for r in recs)
+            out[size] = {
+                "count": len(qs), "min": qs[0], "p50": _pct(qs, 50), "max": qs[-1],
+                "avg_bytes": int(sum(r[1] for r in recs) / len(recs)),
+                "budget": recs[0][2],
+                "over_budget": sum(1 for r in recs if r[1] > r[2]),
+            }
+        return out
+
+    def write(self, path: Path, **kw) -> dict:
+        data = self.build(**kw)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        return data
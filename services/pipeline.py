@@ -0,0 +1,46 @@
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+from PIL import Image
+
+from settings import AppSettings
+from services.image_ops import load_image, max_target_box
+from services.resize import prepare_intermediate, resize_contain
+from services.watermark import add_text_watermark
+from services.metrics import NULL_TIMER
+
+def load_source(src: Path, max_box: Optional[Tuple[int, int]] = None, data: Optional[bytes] = None) -> Image.Image:
+    """디코드/EXIF 회전/모드 변환을 끝낸 원본. 원본당 한 번만 호출한다.
+    max_box가 있으면 그 박스에 필요한 해상도까지만 디코드. data는 미리 읽은 파일 바이트."""
+    im = load_image(src, max_box, data)
+    im.load()
+    return im
+
+def shared_intermediate(im: Image.Image, sizes: Iterable[Tuple[int, int]]) -> Image.Image:
+    """여러 규격이 공유할 축소 중간본. source_size(배치 기준)는 그대로 넘긴다."""
+    src_size = im.info.get("source_size") or im.size
+    mid = prepare_intermediate(im, sizes, src_size)
+    mid.info["source_size"] = src_size
+    return mid
+
+def render_size(im: Image.Image, target: Tuple[int, int], settings: AppSettings, wm_text: str, timer=NULL_TIMER) -> Image.Image:
+    with timer.stage("resize"):
+        canvas = resize_contain(im, target, settings.bg_color, im.info.get("source_size"))
+    with timer.stage("watermark"):
+        return add_text_watermark(
+            canvas,
+            text=wm_text,
+            opacity_pct=settings.wm_opacity,
+            scale_pct=settings.wm_scale_pct,
+            fill_rgb=settings.wm_fill_color,
+            stroke_rgb=settings.wm_stroke_color,
+            stroke_width=settings.wm_stroke_width,
+            anchor_norm=settings.wm_anchor,
+            font_path=settings.wm_font_path,  # 🔹 폰트 전달
+        )
+
+def render_outputs(src: Path, sizes: Iterable[Tuple[int, int]], settings: AppSettings, wm_text: str) -> Iterator[Tuple[Tuple[int, int], Image.Image]]:
+    """원본을 한 번 디코드해서 모든 규격 출력을 차례로 만든다."""
+    sizes = list(sizes)
+    im = shared_intermediate(load_source(src, max_target_box(sizes)), sizes)
+    for size in sizes:
+        yield size, render_size(im, size, settings, wm_text)
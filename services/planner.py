@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import hashlib
+import json
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from settings import AppSettings, RootConfig, APP_VERSION
+from services.manifest import Manifest
+from services.writer import get_profile
+
+@dataclass(frozen=True)
+class Output:
+    """규격 하나에 대한 출력 대상. key는 멱등성 키(매니페스트 대조용).
+    dups: 내용·렌더옵션·규격이 같은 다른 원본의 출력. 렌더하지 않고 이 출력을 링크/복사한다.
+    src: dups에 든 출력의 실제 원본(오류 메시지용). 보통 출력은 None → 소속 Job.src."""
+    size: Tuple[int, int]
+    dst: Path
+    key: str = ""
+    dups: Tuple["Output", ...] = ()
+    src: Optional[Path] = None
+
+@dataclass(frozen=True)
+class Job:
+    """원본 파일 한 장 → 여러 규격 출력. 디코드는 한 번만 한다."""
+    src: Path
+    wm_text: str
+    outputs: Tuple[Output, ...]
+    src_bytes: int = 0  # 계획 시점 파일 크기(미리 읽기 예산 계산용)
+
+@dataclass
+class Plan:
+    jobs: List[Job] = field(default_factory=list)
+    skipped: int = 0    # 매니페스트와 일치해 건너뛴 출력 수
+    deduped: int = 0    # 렌더 없이 다른 출력에서 링크/복사할 출력 수(처리 수에 포함)
+
+def output_path(settings: AppSettings, post: str, size: Tuple[int, int], src: Path) -> Path:
+    w, h = size
+    ext = get_profile(settings.output_profile).ext
+    return settings.output_root / post / f"{w}x{h}" / f"{src.stem}_wm.{ext}"
+
+def _format_spec(settings: AppSettings) -> str:
+    prof = get_profile(settings.output_profile)
+    spec = prof.name if prof.quality is None else f"{prof.name}:q{prof.quality}"
+    return f"{spec}:e{settings.output_effort}" if prof.format == "WEBP" else spec
+
+def render_spec(settings: AppSettings, wm_text: str) -> dict:
+    """출력 결과에 영향을 주는 옵션 전부(규격 제외)."""
+    return {
+        "bg": list(settings.bg_color),
+        "wm_text": wm_text,
+        "wm_opacity": settings.wm_opacity,
+        "wm_scale_pct": settings.wm_scale_pct,
+        "wm_fill": list(settings.wm_fill_color),
+        "wm_stroke": list(settings.wm_stroke_color),
+        "wm_stroke_w": settings.wm_stroke_width,
+        "wm_anchor": [round(float(v), 6) for v in settings.wm_anchor],
+        "wm_font": str(settings.wm_font_path) if settings.wm_font_path else "",
+        "format": _format_spec(settings),
+        "target_kb": {f"{w}x{h}": kb for (w, h), kb in sorted(settings.target_kb.items())},
+        "version": APP_VERSION,
+    }
+
+def job_key(src: Path, src_stat, size: Tuple[int, int], spec_json: str) -> str:
+    """입력경로 + mtime/크기 + 규격 + 렌더 옵션 + 앱버전 → 멱등성 키."""
+    raw = f"{src}|{src_stat.st_mtime_ns}|{src_stat.st_size}|{size[0]}x{size[1]}|{spec_json}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def build_plan(posts: Dict[str, dict], settings: AppSettings, manifest: Manifest | None = None,
+               hashes: Dict[Path, str] | None = None) -> Plan:
+    """게시물 목록 → 실행 계획. 매니페스트와 키가 같고 출력 파일이 있으면 스킵.
+    hashes(원본 → 내용 해시)가 있으면 (내용, 렌더옵션, 규격)이 같은 출력은 처음 것만 렌더하고
+    나머지는 그 출력의 dups로 붙인다."""
+    plan = Plan()
+    pending: List[Tuple[Path, str, int, List[Tuple[Output, list]]]] = []
+    primary: Dict[tuple, list] = {}  # (해시, 렌더옵션, 규격) → 대표 출력의 dups
+    for meta in posts.values():
+        post = meta["post_name"]
+        rc: RootConfig = meta["root"]
+        wm_text = (rc.wm_text or "").strip() or settings.default_wm_text
+        spec_json = json.dumps(render_spec(settings, wm_text), sort_keys=True, ensure_ascii=False)
+        for src in meta["files"]:
+            try:
+                st = src.stat()
+            except OSError:
+                st = None
+            digest = hashes.get(src) if hashes else None
+            outputs = []
+            for size in settings.sizes:
+                dst = output_path(settings, post, size, src)
+                key = job_key(src, st, size, spec_json) if st is not None else ""
+                if manifest is not None and key and manifest.is_done(dst, key):
+                    plan.skipped += 1
+                    continue
+                out = Output(size=tuple(size), dst=dst, key=key)
+                dups: list = []
+                if digest:
+                    dk = (digest, spec_json, out.size)
+                    if dk in primary:
+                        primary[dk].append(replace(out, src=src)); plan.deduped += 1
+                        continue
+                    primary[dk] = dups
+                outputs.append((out, dups))
+            if outputs:
+                pending.append((src, wm_text, st.st_size if st is not None else 0, outputs))
+    for src, wm_text, nbytes, outputs in pending:
+        plan.jobs.append(Job(src=src, wm_text=wm_text, src_bytes=nbytes,
+                             outputs=tuple(replace(o, dups=tuple(d)) if d else o for o, d in outputs)))
+    return plan
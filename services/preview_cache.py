@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from PIL import Image
+
+PREVIEW_CACHE_MB = 256
+
+def image_bytes(im: Image.Image) -> int:
+    return im.width * im.height * len(im.getbands())
+
+class PreviewCache:
+    """미리보기용 디코드 원본/맞춤 캔버스 LRU(메모리 상한).
+    키 첫 요소는 원본 경로 — 같은 경로의 다른 버전(mtime/크기 변경)이 들어오면 예전 것은 바로 버린다."""
+    def __init__(self, budget_mb: int = PREVIEW_CACHE_MB):
+        self.budget = max(0, int(budget_mb)) * 1024 * 1024
+        self._items: "OrderedDict[Tuple, Tuple[Tuple[Image.Image, ...], int]]" = OrderedDict()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[Tuple[Image.Image, ...]]:
+        with self._lock:
+            hit = self._items.get(key)
+            if hit is None:
+                return None
+            self._items.move_to_end(key)
+            return hit[0]
+
+    def put(self, key: Tuple, images: Tuple[Image.Image, ...]):
+        cost = sum(image_bytes(im) for im in images)
+        if cost > self.budget:
+            return
+        with self._lock:
+            for k in [k for k in self._items if k[0] == key[0] and k[1:3] != key[1:3]]:
+                self._drop(k)  # 파일이 바뀜
+            if key in self._items:
+                self._drop(key)
+            self._items[key] = (images, cost)
+            self._used += cost
+            while self._used > self.budget:
+                self._drop(next(iter(self._items)))
+
+    def _drop(self, key: Hashable):
+        _, cost = self._items.pop(key)
+        self._used -= cost
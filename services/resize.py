@@ -1,12 +1,43 @@
+from __future__ import annotations
+from typing import Iterable, List, Tuple
 from PIL import Image
 
-def resize_contain(img: Image.Image, target: tuple, bg: tuple) -> Image.Image:
+# 공유 중간본은 가장 큰 출력 배치 크기의 이 배율 이상으로 유지(LANCZOS 품질 여유)
+INTERMEDIATE_OVERSAMPLE = 2.0
+INTERMEDIATE_MIN_GAIN = 1.25  # 이보다 덜 줄어들면 중간본 비용이 이득보다 큼
+
+def _contain_size(src_size: tuple, target: tuple) -> Tuple[int, int]:
     Wt, Ht = target
-    Ws, Hs = img.size
+    Ws, Hs = src_size
     scale = min(Wt / Ws, Ht / Hs)
-    newW, newH = max(1, int(Ws * scale)), max(1, int(Hs * scale))
+    return max(1, int(Ws * scale)), max(1, int(Hs * scale))
+
+def resize_contain(img: Image.Image, target: tuple, bg: tuple, src_size: tuple | None = None) -> Image.Image:
+    """src_size: 축소 디코드된 img의 원래 크기. 주면 배치(newW/newH)를 원본 기준으로 계산한다."""
+    Wt, Ht = target
+    newW, newH = _contain_size(src_size or img.size, target)
     r = img.resize((newW, newH), Image.Resampling.LANCZOS)
     canvas = Image.new("RGB", (Wt, Ht), bg)
     ox, oy = (Wt - newW) // 2, (Ht - newH) // 2
     canvas.paste(r, (ox, oy), r if r.mode == "RGBA" else None)
     return canvas
+
+def prepare_intermediate(img: Image.Image, targets: Iterable[tuple], src_size: tuple | None = None) -> Image.Image:
+    """여러 규격을 만들 원본을 BOX 필터로 한 번 줄여 둔다(규격마다 큰 원본을 LANCZOS 하지 않도록).
+    가장 큰 출력 배치 크기의 INTERMEDIATE_OVERSAMPLE배는 남기므로 각 규격의 LANCZOS 품질은 그대로.
+    배치는 src_size(원본 크기) 기준으로 계산되므로 resize_contain에 같은 src_size를 넘길 것."""
+    src_size = src_size or img.size
+    need_w = max(_contain_size(src_size, t)[0] for t in targets)
+    # Contain은 비율 유지 → 폭 기준 배율 하나로 충분
+    ratio = img.width / (need_w * INTERMEDIATE_OVERSAMPLE)
+    if ratio < INTERMEDIATE_MIN_GAIN:
+        return img
+    size = (max(1, round(img.width / ratio)), max(1, round(img.height / ratio)))
+    return img.resize(size, Image.Resampling.BOX)
+
+def resize_contain_multi(img: Image.Image, targets: Iterable[tuple], bg: tuple, src_size: tuple | None = None) -> List[Image.Image]:
+    """targets 순서대로 resize_contain 결과. 공유 중간본에서 각각 리샘플한다."""
+    targets = list(targets)
+    src_size = src_size or img.size
+    mid = prepare_intermediate(img, targets, src_size)
+    return [resize_contain(mid, t, bg, src_size) for t in targets]
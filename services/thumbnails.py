@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+from settings import default_cache_dir
+from services.image_ops import load_image
+
+THUMB_SIZE = 96      # 긴 변(px)
+THUMB_QUALITY = 85
+
+class ThumbnailCache:
+    """원본 썸네일 디스크 캐시. (경로, mtime, 크기, 썸네일 크기)가 같으면 다시 디코드하지 않는다.
+    파일이 바뀌면 키가 달라져 새로 만들고, 예전 파일은 그냥 남는다(캐시 폴더는 지워도 무방)."""
+    def __init__(self, root: Optional[Path] = None, size: int = THUMB_SIZE):
+        self.root = Path(root) if root else default_cache_dir() / "thumbs"
+        self.size = size
+
+    def _path(self, src: Path, st: os.stat_result) -> Path:
+        raw = f"{src}|{st.st_mtime_ns}|{st.st_size}|{self.size}"
+        k = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        return self.root / k[:2] / f"{k}.jpg"
+
+    def get(self, src: Path) -> Image.Image:
+        """썸네일(RGB, 긴 변 size 이하). 캐시에 없으면 축소 디코드로 만들고 저장."""
+        src = Path(src)
+        dst = self._path(src, src.stat())
+        try:
+            im = Image.open(dst); im.load()
+            return im
+        except (OSError, ValueError):
+            pass
+        im = load_image(src, (self.size, self.size))
+        im.thumbnail((self.size, self.size), Image.Resampling.LANCZOS)
+        if im.mode == "RGBA":
+            bg = Image.new("RGB", im.size, (255, 255, 255))
+            bg.paste(im, mask=im.getchannel("A")); im = bg
+        else:
+            im = im.convert("RGB")
+        try:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dst.with_name(dst.name + f".{os.getpid()}.tmp")
+            im.save(tmp, format="JPEG", quality=THUMB_QUALITY)
+            os.replace(tmp, dst)
+        except OSError:
+            pass  # 캐시는 없어도 동작에 지장 없음
+        return im
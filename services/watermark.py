@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
@@ -7,36 +8,68 @@ DEFAULT_FONT_CANDIDATES = [
     "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
 ]
 
-def pick_font(size: int, font_path: Optional[Path] = None):
-    # 우선 사용자가 선택한 폰트 시도
-    if font_path:
-        try:
-            return ImageFont.truetype(str(font_path), size=size)
-        except Exception:
-            pass
-    # 후보 폰트 시도
-    for cand in DEFAULT_FONT_CANDIDATES:
+# 프로세스 전역 캐시 크기(폰트 객체 / 맞춤 레이아웃)
+FONT_CACHE_SIZE = 64
+LAYOUT_CACHE_SIZE = 256
+SPRITE_CACHE_SIZE = 32
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _load_font(path: str, size: int):
+    return ImageFont.truetype(path, size=size)
+
+@lru_cache(maxsize=16)
+def _resolve_font_path(font_path: Optional[str]) -> Optional[str]:
+    """실제로 열리는 첫 폰트 경로. 없는 후보는 프로세스당 한 번만 시도한다."""
+    for cand in ([font_path] if font_path else []) + DEFAULT_FONT_CANDIDATES:
         try:
-            return ImageFont.truetype(cand, size=size)
+            _load_font(cand, 12)
+            return cand
         except Exception:
             pass
-    return ImageFont.load_default()
+    return None
 
-def _measure_text(font, text, stroke_width=0):
-    d = ImageDraw.Draw(Image.new("RGB", (10, 10)))
-    bbox = d.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
+def pick_font(size: int, font_path: Optional[Path] = None):
+    # 우선 사용자가 선택한 폰트, 없으면 후보 폰트
+    path = _resolve_font_path(str(font_path) if font_path else None)
+    if path is None:
+        return ImageFont.load_default()
+    return _load_font(path, size)
+
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (10, 10)))
+
+def measure_text(font, text, stroke_width=0):
+    bbox = _MEASURE_DRAW.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
     return bbox[2] - bbox[0], bbox[3] - bbox[1]
 
-def _fit_font_by_width(text: str, target_w: int, low=8, high=512, stroke_width=2, font_path: Optional[Path]=None):
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _fit_layout(text: str, font_path: Optional[str], target_w: int, stroke_width: int, low=8, high=512) -> Tuple[int, int, int]:
+    """(폰트 크기, 텍스트 폭, 텍스트 높이). 같은 텍스트/폰트/폭이면 재계산하지 않는다."""
     best = low
     while low <= high:
         mid = (low + high) // 2
-        w, _ = _measure_text(pick_font(mid, font_path), text, stroke_width=stroke_width)
+        w, _ = measure_text(pick_font(mid, font_path), text, stroke_width=stroke_width)
         if w <= target_w:
             best = mid; low = mid + 1
         else:
             high = mid - 1
-    return best
+    tw, th = measure_text(pick_font(best, font_path), text, stroke_width=stroke_width)
+    return best, tw, th
+
+@lru_cache(maxsize=SPRITE_CACHE_SIZE)
+def _render_sprite(text: str, font_path: Optional[str], size: int, stroke_width: int,
+                   fill_rgba: Tuple[int, int, int, int], stroke_rgba: Tuple[int, int, int, int]) -> Tuple[Image.Image, int, int]:
+    """잉크 영역만 담은 RGBA 스프라이트와, 그리기 원점 대비 오프셋(dx, dy).
+    반환된 이미지는 캐시에 공유되므로 수정하지 말 것."""
+    font = pick_font(size, font_path)
+    sw = max(0, int(stroke_width))
+    bx0, by0, bx1, by1 = _MEASURE_DRAW.textbbox((0, 0), text, font=font, stroke_width=sw)
+    sprite = Image.new("RGBA", (max(1, bx1 - bx0), max(1, by1 - by0)), (0, 0, 0, 0))
+    d = ImageDraw.Draw(sprite)
+    d.text((-bx0, -by0), text, font=font, fill=fill_rgba, stroke_width=sw, stroke_fill=stroke_rgba)
+    return sprite, bx0, by0
+
+def fit_font_by_width(text: str, target_w: int, low=8, high=512, stroke_width=2, font_path: Optional[Path]=None):
+    return _fit_layout(text, str(font_path) if font_path else None, target_w, stroke_width, low, high)[0]
 
 def add_text_watermark(
     img: Image.Image,
@@ -57,8 +90,8 @@ def add_text_watermark(
     short = min(W, H)
     target_w = max(1, int(short * (scale_pct / 100.0)))
 
-    font = pick_font(_fit_font_by_width(text, target_w, stroke_width=stroke_width, font_path=font_path), font_path)
-    tw, th = _measure_text(font, text, stroke_width=stroke_width)
+    font_key = str(font_path) if font_path else None
+    size, tw, th = _fit_layout(text, font_key, target_w, stroke_width)
 
     ax = min(1.0, max(0.0, float(anchor_norm[0])))
     ay = min(1.0, max(0.0, float(anchor_norm[1])))
@@ -70,12 +103,18 @@ def add_text_watermark(
     fill_rgba = (*fill_rgb, alpha)
     stroke_rgba = (*stroke_rgb, alpha)
 
-    over = Image.new("RGBA", (W, H), (0, 0, 0, 0))
-    d = ImageDraw.Draw(over)
-    d.text((x, y), text, font=font, fill=fill_rgba,
-           stroke_width=max(0, int(stroke_width)), stroke_fill=stroke_rgba)
-    base = img.convert("RGBA")
-    return Image.alpha_composite(base, over).convert("RGB")
+    # 배치 내내 같은 스프라이트를 재사용하고, 합성은 잉크 bbox 영역에만 한다.
+    sprite, dx, dy = _render_sprite(text, font_key, size, stroke_width, fill_rgba, stroke_rgba)
+    sx0, sy0 = x + dx, y + dy
+    box = (max(0, sx0), max(0, sy0), min(W, sx0 + sprite.width), min(H, sy0 + sprite.height))
+    out = img.convert("RGB") if img.mode != "RGB" else img.copy()
+    if box[0] >= box[2] or box[1] >= box[3]:
+        return out
+    src = img if img.mode == "RGB" else img.convert("RGBA")
+    patch = src.crop(box).convert("RGBA")
+    over = sprite.crop((box[0] - sx0, box[1] - sy0, box[2] - sx0, box[3] - sy0))
+    out.paste(Image.alpha_composite(patch, over).convert("RGB"), box[:2])
+    return out
 
 def add_center_watermark(*args, **kwargs):
     kwargs.pop("anchor_norm", None)
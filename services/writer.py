@@ -1,5 +1,119 @@
+import io
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    from PIL import features
+    WEBP_AVAILABLE = bool(features.check("webp"))
+except Exception:
+    WEBP_AVAILABLE = False
+
+JPEG_QUALITY = 92
+JPEG_MIN_QUALITY = 40  # 용량 맞추기에서 이 아래로는 내리지 않는다(넘치면 최저 품질로 저장)
+WEBP_QUALITY = 90
+DEFAULT_EFFORT = 4     # WebP method(0 빠름 ~ 6 작음)
+
+@dataclass(frozen=True)
+class OutputProfile:
+    """출력 형식 하나. params는 PIL save 인자, ext는 '<stem>_wm.<ext>'의 확장자."""
+    name: str
+    format: str
+    ext: str
+    quality: Optional[int]          # None → 품질 개념 없음(무손실)
+    params: Dict[str, object] = field(default_factory=dict)
+    search_params: Dict[str, object] = field(default_factory=dict)  # 용량 맞추기 탐색용(빠른 근사)
+
+OUTPUT_PROFILES: Dict[str, OutputProfile] = {p.name: p for p in (
+    OutputProfile("jpeg-fast", "JPEG", "jpg", JPEG_QUALITY, {"subsampling": 1}),
+    OutputProfile("jpeg-optimized", "JPEG", "jpg", JPEG_QUALITY, {"subsampling": 1, "optimize": True},
+                  {"optimize": False}),
+    OutputProfile("jpeg-progressive", "JPEG", "jpg", JPEG_QUALITY, {"subsampling": 1, "optimize": True, "progressive": True},
+                  {"optimize": False, "progressive": False}),
+    OutputProfile("webp", "WEBP", "webp", WEBP_QUALITY),
+    OutputProfile("webp-lossless", "WEBP", "webp", None, {"lossless": True}),
+)}
+DEFAULT_PROFILE = "jpeg-optimized"  # 기존 출력과 같음
+
+def get_profile(name: str) -> OutputProfile:
+    """이름 → 프로필. 모르는 이름이거나 WebP 미지원 Pillow면 ValueError."""
+    try:
+        prof = OUTPUT_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"unknown output profile: {name} (choose from {', '.join(OUTPUT_PROFILES)})") from None
+    if prof.format == "WEBP" and not WEBP_AVAILABLE:
+        raise ValueError("this Pillow build has no WebP support")
+    return prof
+
+def _save_kwargs(prof: OutputProfile, quality: Optional[int], effort: int, fast: bool = False) -> dict:
+    kw = dict(prof.params)
+    if fast:
+        kw.update(prof.search_params)
+    if prof.format == "WEBP":
+        effort = min(6, max(0, int(effort)))
+        kw["method"] = effort
+        if prof.quality is None:
+            kw["quality"] = round(effort * 100 / 6)  # 무손실: quality = 압축 노력
+    if quality is not None:
+        kw["quality"] = quality
+    return kw
+
+def encode_image(img, prof: OutputProfile, effort: int = DEFAULT_EFFORT, quality: Optional[int] = None, fast: bool = False) -> bytes:
+    """디스크를 건드리지 않고 메모리에서 인코딩(워커 프로세스용)."""
+    buf = io.BytesIO()
+    img.save(buf, format=prof.format, **_save_kwargs(prof, quality if quality is not None else prof.quality, effort, fast))
+    return buf.getvalue()
+
+def encode_target(img, prof: OutputProfile, max_bytes: int, effort: int = DEFAULT_EFFORT,
+                  q_min: int = JPEG_MIN_QUALITY) -> Tuple[bytes, Optional[int]]:
+    """max_bytes 이하가 되는 가장 높은 품질로 인코딩 → (바이트, 품질).
+    탐색은 search_params(JPEG는 optimize=False, 빠름)로 이분하고 최종본만 원래 설정으로 다시 인코딩한다.
+    허프만 최적화/프로그레시브는 보통 크기를 줄이지만, 드물게 넘치면 한 단계씩 더 내린다.
+    품질 개념이 없는 무손실 프로필은 그대로 인코딩(품질 None)."""
+    q_max = prof.quality
+    data = encode_image(img, prof, effort)
+    if q_max is None or len(data) <= max_bytes:
+        return data, q_max
+    lo, hi, best = q_min, q_max - 1, None
+    while lo <= hi:
+        q = (lo + hi) // 2
+        if len(encode_image(img, prof, effort, q, fast=True)) <= max_bytes:
+            best = q; lo = q + 1
+        else:
+            hi = q - 1
+    q = best if best is not None else q_min
+    data = encode_image(img, prof, effort, q)
+    while len(data) > max_bytes and q > q_min:
+        q -= 1; data = encode_image(img, prof, effort, q)
+    return data, q
+
+def encode_jpeg(img, quality: int = JPEG_QUALITY) -> bytes:
+    return encode_image(img, OUTPUT_PROFILES[DEFAULT_PROFILE], quality=quality)
+
+def tmp_path(dst: Path) -> Path:
+    return dst.with_name(dst.name + ".tmp")
+
+def write_atomic(data: bytes, dst: Path, fsync: bool = False):
+    """임시파일에 쓰고 rename → 중간에 죽어도 최종 이름으로 반쯤 쓴 파일이 남지 않는다."""
+    tmp = tmp_path(dst)
+    try:
+        f = open(tmp, "wb")
+    except FileNotFoundError:
+        # 미리 만든 폴더가 실행 중 지워진 경우 등
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        f = open(tmp, "wb")
+    with f:
+        f.write(data)
+        if fsync:
+            f.flush(); os.fsync(f.fileno())
+    os.replace(tmp, dst)
+
+def ensure_dirs(dirs: Iterable[Path]):
+    """출력 폴더를 계획 단위로 한 번에 만든다(출력마다 mkdir 하지 않도록)."""
+    for d in sorted(set(dirs)):
+        d.mkdir(parents=True, exist_ok=True)
 
 def save_jpeg(img, dst: Path, quality: int = 92):
     dst.parent.mkdir(parents=True, exist_ok=True)
-    img.save(str(dst), format="JPEG", quality=quality, subsampling=1, optimize=True)
+    write_atomic(encode_jpeg(img, quality), dst)
@@ -1,6 +1,11 @@
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+from services.dedup import check_dedup_mode
+
+APP_VERSION = "0.1"  # 매니페스트 멱등성 키에 포함(렌더 결과가 바뀌면 올릴 것)
 
 DEFAULT_SIZES = [(1080, 1080), (1080, 1350), (1080, 1920)]
 DEFAULT_BG = (255, 255, 255)
@@ -10,6 +15,8 @@ DEFAULT_WM_FILL = (0, 0, 0)
 DEFAULT_WM_STROKE = (255, 255, 255)
 DEFAULT_WM_STROKE_W = 2
 
+ANY_SIZE = (0, 0)  # target_kb에서 '모든 규격' 키
+
 @dataclass
 class RootConfig:
     path: Path
@@ -33,9 +40,51 @@ class AppSettings:
     # 🔹 새 옵션: TrueType/OpenType 폰트 파일 경로
     wm_font_path: Optional[Path] = None
 
+    # 배치 워커 프로세스 수(0 이하 → 코어-1)
+    workers: int = 0
+
+    # 단계별 계측 + <output_root>/run_report.json 작성(선택)
+    profile: bool = False
+
+    # 원본 미리 읽기 버퍼 상한(MB). 네트워크 드라이브에서 I/O와 연산을 겹친다. 0 → 끔
+    prefetch_mb: int = 256
+
+    # 출력 N개씩 모아 fsync 후 rename(전원 차단 대비). 0 → fsync 안 함(rename만)
+    fsync_group: int = 0
+
+    # 규격별 출력 용량 상한(KB). 있으면 그 안에 들어가는 최고 JPEG 품질을 찾아 저장. ANY_SIZE 키 = 나머지 전부
+    target_kb: Dict[Tuple[int, int], int] = None
+
+    # 출력 형식(services.writer.OUTPUT_PROFILES)과 WebP 인코더 노력(0 빠름 ~ 6 작음)
+    output_profile: str = "jpeg-optimized"
+    output_effort: int = 4
+
+    # 내용이 같은 원본 중복 제거: "off" | "link"(하드링크) | "copy"
+    dedup: str = "off"
+
     def __post_init__(self):
         if self.sizes is None:
             self.sizes = list(DEFAULT_SIZES)
+        if self.target_kb is None:
+            self.target_kb = {}
+        if not self.workers or self.workers < 1:
+            self.workers = default_workers()
+
+    def byte_budget(self, size: Tuple[int, int]) -> int:
+        """규격의 출력 용량 상한(바이트). 0이면 제한 없음(고정 품질)."""
+        kb = self.target_kb.get(tuple(size), self.target_kb.get(ANY_SIZE, 0))
+        return max(0, int(kb)) * 1024
+
+def default_cache_dir() -> Path:
+    """스캔/해시/썸네일 캐시 위치(사용자별). SIMPLE_WATERMARK_CACHE로 바꿀 수 있다."""
+    env = os.environ.get("SIMPLE_WATERMARK_CACHE")
+    if env:
+        return Path(env)
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or (Path.home() / ".cache")
+    return Path(base) / "simple_watermark"
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
 
 def hex_to_rgb(hexstr: str) -> Tuple[int, int, int]:
     hs = hexstr.lstrip("#")
@@ -46,3 +95,73 @@ def hex_to_rgb(hexstr: str) -> Tuple[int, int, int]:
         return (r, g, b)
     except Exception:
         return DEFAULT_BG
+
+def parse_size(s: str) -> Tuple[int, int]:
+    """'1080x1350' → (1080, 1350)"""
+    w, h = s.lower().replace(" ", "").replace("×", "x").split("x")
+    return int(w), int(h)
+
+def parse_target_kb(s: str) -> Tuple[Tuple[int, int], int]:
+    """'1080x1350=500' → ((1080, 1350), 500), '500' → (ANY_SIZE, 500)"""
+    if "=" in s:
+        size, kb = s.split("=", 1)
+        return parse_size(size), int(kb)
+    return ANY_SIZE, int(s)
+
+def _color(v) -> Tuple[int, int, int]:
+    return hex_to_rgb(v) if isinstance(v, str) else tuple(int(c) for c in v)
+
+def _settings_from_dict(d: dict) -> AppSettings:
+    s = AppSettings()
+    if d.get("output_root"): s.output_root = Path(d["output_root"])
+    if d.get("sizes"):
+        s.sizes = [parse_size(v) if isinstance(v, str) else (int(v[0]), int(v[1])) for v in d["sizes"]]
+    if "bg_color" in d: s.bg_color = _color(d["bg_color"])
+    for k in ("wm_opacity", "wm_scale_pct", "wm_stroke_width", "workers", "prefetch_mb", "fsync_group", "output_effort"):
+        if k in d: setattr(s, k, int(d[k]))
+    if d.get("default_wm_text"): s.default_wm_text = str(d["default_wm_text"])
+    if "wm_fill_color" in d: s.wm_fill_color = _color(d["wm_fill_color"])
+    if "wm_stroke_color" in d: s.wm_stroke_color = _color(d["wm_stroke_color"])
+    if "wm_anchor" in d:
+        a = d["wm_anchor"]
+        if isinstance(a, str): a = a.split(",")
+        s.wm_anchor = (float(a[0]), float(a[1]))
+    if d.get("wm_font_path"): s.wm_font_path = Path(d["wm_font_path"])
+    if d.get("dedup"): s.dedup = check_dedup_mode(d["dedup"])
+    if d.get("output_profile"): s.output_profile = str(d["output_profile"]).strip()
+    if d.get("target_kb"):
+        # JSON: 500 | {"1080x1350": 500, "*": 800}, INI: "1080x1350=500, 800"
+        t = d["target_kb"]
+        if isinstance(t, dict):
+            s.target_kb = {(ANY_SIZE if k == "*" else parse_size(k)): int(v) for k, v in t.items()}
+        else:
+            s.target_kb = dict(parse_target_kb(v.strip()) for v in str(t).split(",") if v.strip())
+    if "profile" in d:
+        v = d["profile"]
+        s.profile = v.strip().lower() in ("1", "true", "yes", "on") if isinstance(v, str) else bool(v)
+    s.__post_init__()
+    return s
+
+def load_config(path: Path) -> Tuple[AppSettings, List[RootConfig]]:
+    """JSON 또는 INI 설정 파일 → (AppSettings, 루트 목록).
+    JSON: {"output_root": ..., "sizes": ["1080x1080"], "roots": [{"path": ..., "wm_text": ...}], ...}
+    INI : [settings] 섹션에 같은 키(sizes는 콤마 구분), 루트는 [root.*] 섹션마다 path/wm_text.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        import json
+        d = json.loads(path.read_text(encoding="utf-8"))
+        roots_raw = d.get("roots", [])
+    else:
+        import configparser
+        cp = configparser.ConfigParser(interpolation=None)
+        cp.read(path, encoding="utf-8")
+        d = dict(cp["settings"]) if cp.has_section("settings") else {}
+        if "sizes" in d: d["sizes"] = [v for v in d["sizes"].split(",") if v.strip()]
+        roots_raw = [dict(cp[sec]) for sec in cp.sections() if sec.startswith("root")]
+    settings = _settings_from_dict(d)
+    roots = [
+        RootConfig(path=Path(r["path"]), wm_text=r.get("wm_text") or settings.default_wm_text)
+        for r in roots_raw if r.get("path")
+    ]
+    return settings, roots
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import queue
+import sys
+from typing import Any, Callable, Dict
+
+class UiEventChannel:
+    """워커 스레드 → Tk 메인 스레드 이벤트 전달.
+    - post()는 어느 스레드에서나 호출 가능(큐에 넣기만 함)
+    - 메인 스레드가 after()로 interval_ms마다 큐를 비우며 핸들러 호출
+    - coalesce 종류(기본: progress)는 한 번 비울 때 마지막 값만 전달
+    """
+    def __init__(self, widget, interval_ms: int = 100, coalesce=("progress",)):
+        self._widget = widget
+        self._interval = interval_ms
+        self._coalesce = set(coalesce)
+        self._q: "queue.SimpleQueue[tuple[str, Any]]" = queue.SimpleQueue()
+        self._handlers: Dict[str, Callable[[Any], None]] = {}
+        self._widget.after(self._interval, self._drain)
+
+    def on(self, kind: str, handler: Callable[[Any], None]):
+        self._handlers[kind] = handler
+
+    def post(self, kind: str, payload: Any = None):
+        self._q.put((kind, payload))
+
+    def _drain(self):
+        latest: Dict[str, Any] = {}
+        try:
+            while True:
+                kind, payload = self._q.get_nowait()
+                if kind in self._coalesce:
+                    latest[kind] = payload
+                    continue
+                # 순서가 중요한 이벤트(done 등) 앞에서는 밀린 진행률부터 내보낸다
+                self._flush(latest)
+                self._dispatch(kind, payload)
+        except queue.Empty:
+            pass
+        self._flush(latest)
+        try:
+            self._widget.after(self._interval, self._drain)
+        except Exception:
+            pass  # 창이 이미 닫힘
+
+    def _flush(self, latest: Dict[str, Any]):
+        for kind, payload in latest.items():
+            self._dispatch(kind, payload)
+        latest.clear()
+
+    def _dispatch(self, kind: str, payload: Any):
+        handler = self._handlers.get(kind)
+        if handler is None:
+            return
+        try:
+            handler(payload)
+        except Exception:
+            # 핸들러 오류로 폴링 루프가 끊기지 않도록 Tk 기본 보고로 넘김
+            self._widget.report_callback_exception(*sys.exc_info())
@@ -19,6 +19,8 @@ from ui.post_list import PostList
 from ui.preview_pane import PreviewPane
 from ui.options_panel import OptionsPanel
 from ui.status_bar import StatusBar
+from ui.event_channel import UiEventChannel
+from workers.preview_worker import PreviewRenderer
 
 class MainWindow(BaseTk):
     def __init__(self, controller: AppController):
@@ -29,9 +31,22 @@ class MainWindow(BaseTk):
         self.controller = controller
         self.posts: Dict[str, dict] = {}
         self._wm_anchor = (0.5, 0.5)   # 🔹 현재 선택된 워터마크 위치(정규화)
+        self._batch_errors: list[str] = []
 
         self._build_ui()
 
+        # 워커 스레드 콜백은 큐로 받아 메인 스레드에서 처리(진행률/미리보기는 마지막 것만)
+        self.events = UiEventChannel(self, interval_ms=100, coalesce=("progress", "preview"))
+        self.events.on("progress", self.status.set_progress)
+        self.events.on("error", self._batch_errors.append)
+        self.events.on("done", self._on_batch_done)
+        self.events.on("failed", self._on_batch_failed)
+        self.events.on("preview", self._on_preview_ready)
+
+        # 미리보기 디코드/리사이즈는 백그라운드에서(최신 요청만 반영)
+        self.previewer = PreviewRenderer(lambda gen, result, err: self.events.post("preview", (gen, result, err)))
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
     def _build_ui(self):
         self.opt = OptionsPanel(self)
         self.opt.pack(fill="x", padx=8, pady=6)
@@ -47,10 +62,21 @@ class MainWindow(BaseTk):
         ttk.Button(tbar, text="Scan Posts", command=self.on_scan).pack(side="left")
         ttk.Button(tbar, text="Preview Selected", command=self.on_preview).pack(side="left", padx=6)
 
-        self.status = StatusBar(self, on_start=self.on_start_batch)
+        self.status = StatusBar(
+            self, on_start=self.on_start_batch,
+            on_pause=self.controller.pause_batch,
+            on_resume=self.controller.resume_batch,
+            on_cancel=self.controller.cancel_batch,
+        )
         self.status.pack(fill="x", padx=8, pady=6)
 
     # -------- Callbacks --------
+    def _on_close(self):
+        # 백그라운드 스레드를 멈추고 창 닫기(진행 중인 미리보기 렌더 결과는 버림)
+        self.previewer.close()
+        self.post_list.close()
+        self.destroy()
+
     def _on_anchor_change(self, norm_xy):
         """미리보기에서 위치를 바꾸면 즉시 반영해서 재렌더."""
         self._wm_anchor = norm_xy
@@ -71,7 +97,7 @@ class MainWindow(BaseTk):
 
     def _collect_settings(self) -> AppSettings:
         (sizes, bg_hex, wm_opacity, wm_scale, out_root_str, roots,
-         wm_fill_hex, wm_stroke_hex, wm_stroke_w, wm_font_path_str) = self.opt.collect_options()
+         wm_fill_hex, wm_stroke_hex, wm_stroke_w, wm_font_path_str, workers) = self.opt.collect_options()
 
         if not out_root_str and roots:
             messagebox.showinfo("Output", "Output Root is empty. It will be created as <first_root>/export.")
@@ -89,6 +115,7 @@ class MainWindow(BaseTk):
             wm_stroke_width=int(wm_stroke_w),
             wm_anchor=self._wm_anchor,
             wm_font_path=Path(wm_font_path_str) if wm_font_path_str else None,  # 🔹 폰트 전달
+            workers=int(workers),
         )
 
     def on_preview(self):
@@ -116,16 +143,23 @@ class MainWindow(BaseTk):
         }
         self.preview.set_wm_preview_config(wm_cfg)
 
-        try:
-            before_img, after_img = self.controller.preview_by_key(key, self.posts, settings)
-        except Exception as e:
-            messagebox.showerror("Preview Error", str(e));
-            return
-
+        # 설정은 여기(Tk 스레드)서 다 읽어 두고, 렌더만 워커로
+        posts = self.posts
+        self.previewer.submit(lambda: self.controller.preview_by_key(key, posts, settings))
+
+    def _on_preview_ready(self, payload):
+        gen, result, err = payload
+        if gen != self.previewer.latest:
+            return  # 그사이 새 요청이 들어옴 → 그 결과를 기다린다
+        if err is not None:
+            messagebox.showerror("Preview Error", str(err)); return
+        before_img, after_img = result
         self.preview.show(before_img, after_img)
         self.preview.set_anchor(self._wm_anchor)
 
     def on_start_batch(self):
+        if self.controller.is_running:
+            messagebox.showinfo("Run", "A batch is already running."); return
         # 현재 리스트에 남아있는 항목만 처리
         visible_keys = self.post_list.get_all_keys()
         if not visible_keys:
@@ -140,13 +174,41 @@ class MainWindow(BaseTk):
             messagebox.showinfo("Run", "Nothing to process."); return
 
         self.status.reset(total)
+        self._batch_errors.clear()
+
+        # 아래 콜백은 워커 스레드에서 불리므로 위젯을 직접 만지지 않는다
+        self.controller.start_batch(
+            settings, visible_posts,
+            lambda val: self.events.post("progress", val),
+            lambda processed, skipped: self.events.post("done", (processed, skipped)),
+            lambda msg: self.events.post("error", msg),
+            lambda msg: self.events.post("failed", msg),
+        )
 
-        def on_progress(val: int):
-            self.status.set_progress(val)
-        def on_done(processed: int):
-            messagebox.showinfo("Done", f"Finished. Processed {processed} items.")
-            self.status.finish()
-        def on_error(msg: str):
-            messagebox.showerror("Run Error", msg)
-
-        self.controller.start_batch(settings, visible_posts, on_progress, on_done, on_error)
+    def _on_batch_done(self, result):
+        processed, skipped = result
+        cancelled = self.controller.cancelled
+        self.status.finish(cancelled=cancelled)
+        msg = f"Finished. Processed {processed} items."
+        if cancelled:
+            # 완료분은 매니페스트에 기록돼 있어 다시 Start하면 나머지만 처리
+            msg = f"Stopped. Processed {processed} items.\nStart again to process only the remaining items."
+        if skipped:
+            msg += f"\nSkipped {skipped} unchanged items."
+        if not self._batch_errors:
+            messagebox.showinfo("Done", msg); return
+        # 실패는 파일마다 띄우지 않고 끝에서 한 번에 요약
+        messagebox.showwarning("Done with errors", f"{msg}\n{len(self._batch_errors)} failed:\n\n{self._error_detail()}")
+
+    def _on_batch_failed(self, message: str):
+        # 배치 전체가 중단됨(done은 오지 않음) → 버튼을 되살리고 원인을 알린다
+        self.status.finish(cancelled=True)
+        msg = f"Batch failed: {message}"
+        if self._batch_errors:
+            msg += f"\n\n{len(self._batch_errors)} items failed before that:\n{self._error_detail()}"
+        messagebox.showerror("Batch failed", msg)
+
+    def _error_detail(self, limit: int = 15) -> str:
+        shown = self._batch_errors[:limit]
+        more = len(self._batch_errors) - len(shown)
+        return "\n".join(shown) + (f"\n… and {more} more" if more else "")
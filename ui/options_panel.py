@@ -4,7 +4,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser
 from typing import List
 from pathlib import Path
-from settings import DEFAULT_SIZES, DEFAULT_WM_TEXT, RootConfig
+from settings import DEFAULT_SIZES, DEFAULT_WM_TEXT, RootConfig, default_workers
 
 # DnD
 try:
@@ -38,6 +38,11 @@ class OptionsPanel(ttk.Frame):
         self.cb_size = ttk.Combobox(size_frame, textvariable=self.var_size, values=preset, width=12, state="readonly")
         self.cb_size.grid(row=1, column=0, sticky="w")
 
+        # 배치 워커 프로세스 수
+        ttk.Label(size_frame, text="Workers:").grid(row=0, column=1, sticky="w", padx=(8,0))
+        self.var_workers = tk.IntVar(value=default_workers())
+        ttk.Spinbox(size_frame, from_=1, to=64, textvariable=self.var_workers, width=5).grid(row=1, column=1, sticky="w", padx=(8,0))
+
         # Watermark + BG
         wm = ttk.LabelFrame(self, text="Watermark (center) & Background"); wm.pack(fill="x", pady=(6, 0))
 
@@ -144,6 +149,7 @@ class OptionsPanel(ttk.Frame):
             self.var_stroke.get().strip() or "#FFFFFF",
             int(self.var_stroke_w.get()),
             font_path or "",  # 🔹 추가 반환
+            int(self.var_workers.get()),
         )
 
     # ----- Browsers -----
@@ -2,20 +2,57 @@
 from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk
+from pathlib import Path
+from typing import Dict, List
+
+from PIL import Image, ImageTk
+
+from services.thumbnails import THUMB_SIZE
+from ui.event_channel import UiEventChannel
+from workers.thumb_worker import ThumbnailLoader
+
+ROW_THUMB = 48            # 목록 행 썸네일(긴 변 px)
+STRIP_THUMB = THUMB_SIZE  # 선택 게시물 썸네일 줄
+STRIP_PAD = 6
 
 class PostList(ttk.Frame):
+    """게시물 목록(행마다 첫 이미지 썸네일) + 선택한 게시물의 썸네일 줄.
+    썸네일은 화면에 보이는 행/칸만 백그라운드에서 만든다(축소 디코드 + 디스크 캐시)."""
     def __init__(self, master, on_select=None):
         super().__init__(master)
         self._on_select = on_select
         self._posts = {}
 
+        # 썸네일: 원본 경로(str) 기준으로 목록/줄이 공유
+        self._thumb_pil: Dict[str, Image.Image] = {}
+        self._row_tk: Dict[str, ImageTk.PhotoImage] = {}
+        self._strip_tk: Dict[str, ImageTk.PhotoImage] = {}
+        self._rows_by_src: Dict[str, List[str]] = {}
+        self._strip_files: List[Path] = []
+        self._strip_items: Dict[str, int] = {}
+        self._visible_pending = False
+
         ttk.Label(self, text="Posts").pack(anchor="w")
 
-        self.lb = tk.Listbox(self, height=20)
-        self.lb.pack(fill="both", expand=True, pady=4)
-        self.lb.bind("<<ListboxSelect>>", self._handle_select)
+        ttk.Style(self).configure("Thumb.Treeview", rowheight=ROW_THUMB + 4)
+        body = ttk.Frame(self); body.pack(fill="both", expand=True, pady=4)
+        self.tree = ttk.Treeview(body, show="tree", selectmode="browse", style="Thumb.Treeview")
+        sb = ttk.Scrollbar(body, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=lambda a, b: (sb.set(a, b), self._queue_visible()))
+        sb.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<<TreeviewSelect>>", self._handle_select)
         # Delete 키로 빠른 삭제
-        self.lb.bind("<Delete>", lambda e: self.remove_selected())
+        self.tree.bind("<Delete>", lambda e: self.remove_selected())
+        self.tree.bind("<Configure>", lambda e: self._queue_visible())
+
+        # 선택한 게시물의 이미지들(가로 스크롤)
+        self.strip = tk.Canvas(self, height=STRIP_THUMB + 2 * STRIP_PAD, highlightthickness=0, background="#F4F4F4")
+        ssb = ttk.Scrollbar(self, orient="horizontal", command=self.strip.xview)
+        self.strip.configure(xscrollcommand=lambda a, b: (ssb.set(a, b), self._queue_visible()))
+        self.strip.pack(fill="x")
+        ssb.pack(fill="x")
+        self.strip.bind("<Configure>", lambda e: self._queue_visible())
 
         # 하단 정보/버튼
         bottom = ttk.Frame(self); bottom.pack(fill="x")
@@ -26,48 +63,136 @@ class PostList(ttk.Frame):
         ttk.Button(btns, text="Remove", command=self.remove_selected).pack(side="left")
         ttk.Button(btns, text="Remove All", command=self.remove_all).pack(side="left", padx=6)
 
+        # 썸네일 워커 → 메인 스레드
+        self._events = UiEventChannel(self, interval_ms=50, coalesce=())
+        self._events.on("thumb", self._on_thumb)
+        self._loader = ThumbnailLoader(lambda key, im: self._events.post("thumb", (key, im)))
+
     # ----- Public API -----
     def set_posts(self, posts: dict):
         """posts: dict[key -> meta]. key 형식: 'RootName/PostName'"""
         self._posts = posts
-        self.lb.delete(0, tk.END)
-        for name in self._posts.keys():
-            self.lb.insert(tk.END, name)
+        self.tree.delete(*self.tree.get_children())
+        # 재스캔: 파일이 바뀌었을 수 있으니 메모리 썸네일은 비움(디스크 캐시는 mtime 키라 안전)
+        self._loader.forget()
+        self._thumb_pil.clear(); self._row_tk.clear(); self._strip_tk.clear()
+        self._rows_by_src.clear()
+        for name, meta in self._posts.items():
+            self.tree.insert("", tk.END, iid=name, text=name)
+            if meta["files"]:
+                self._rows_by_src.setdefault(str(meta["files"][0]), []).append(name)
+        self._show_strip(None)
         self._update_count()
+        self._queue_visible()
 
     def get_selected_post(self) -> str | None:
-        sel = self.lb.curselection()
+        sel = self.tree.selection()
         if not sel:
             return None
-        return self.lb.get(sel[0])
+        return sel[0]
 
     def get_all_keys(self) -> list[str]:
         """현재 리스트에 남아있는 key들(배치 실행 시 이 목록만 처리)."""
-        return [self.lb.get(i) for i in range(self.lb.size())]
+        return list(self.tree.get_children(""))
+
+    def close(self):
+        """썸네일 워커 종료(창 닫을 때)."""
+        self._loader.close()
 
     # ----- Actions -----
     def remove_selected(self):
-        sel = self.lb.curselection()
+        sel = self.tree.selection()
         if not sel:
             return
-        # 여러 개 선택돼 있을 수 있으니 뒤에서 앞으로 지움
-        for i in reversed(sel):
-            self.lb.delete(i)
+        self.tree.delete(*sel)
         self._update_count()
         # 선택 변경 콜백
-        if self._on_select:
-            self._on_select(self.get_selected_post())
+        self._handle_select(None)
 
     def remove_all(self):
-        self.lb.delete(0, tk.END)
+        self.tree.delete(*self.tree.get_children())
         self._update_count()
+        self._show_strip(None)
         if self._on_select:
             self._on_select(None)
 
     # ----- Internal -----
     def _handle_select(self, _evt):
+        key = self.get_selected_post()
+        self._show_strip(key)
         if self._on_select:
-            self._on_select(self.get_selected_post())
+            self._on_select(key)
 
     def _update_count(self):
-        self.lbl_info.configure(text=f"{self.lb.size()} posts")
+        self.lbl_info.configure(text=f"{len(self.tree.get_children(''))} posts")
+
+    # ---- 썸네일 줄 ----
+    def _show_strip(self, key: str | None):
+        files = list(self._posts[key]["files"]) if key and key in self._posts else []
+        if files == self._strip_files:
+            return
+        self._strip_files = files
+        self.strip.delete("all"); self._strip_items.clear()
+        cell = STRIP_THUMB + STRIP_PAD
+        for i, src in enumerate(files):
+            x = STRIP_PAD + i * cell
+            self.strip.create_rectangle(x, STRIP_PAD, x + STRIP_THUMB, STRIP_PAD + STRIP_THUMB,
+                                        outline="#D0D0D0", fill="#E8E8E8")
+            item = self.strip.create_image(x + STRIP_THUMB // 2, STRIP_PAD + STRIP_THUMB // 2, anchor="center")
+            self._strip_items[str(src)] = item
+            if str(src) in self._thumb_pil:
+                self.strip.itemconfigure(item, image=self._strip_image(str(src)))
+        self.strip.configure(scrollregion=(0, 0, STRIP_PAD + len(files) * cell, STRIP_THUMB + 2 * STRIP_PAD))
+        self.strip.xview_moveto(0)
+        self._queue_visible()
+
+    def _strip_image(self, src: str) -> ImageTk.PhotoImage:
+        tkimg = self._strip_tk.get(src)
+        if tkimg is None:
+            tkimg = self._strip_tk[src] = ImageTk.PhotoImage(self._thumb_pil[src])
+        return tkimg
+
+    def _row_image(self, src: str) -> ImageTk.PhotoImage:
+        tkimg = self._row_tk.get(src)
+        if tkimg is None:
+            im = self._thumb_pil[src].copy()
+            im.thumbnail((ROW_THUMB, ROW_THUMB), Image.Resampling.LANCZOS)
+            tkimg = self._row_tk[src] = ImageTk.PhotoImage(im)
+        return tkimg
+
+    # ---- 보이는 항목만 요청 ----
+    def _queue_visible(self):
+        if not self._visible_pending:
+            self._visible_pending = True
+            self.after_idle(self._request_visible)
+
+    def _request_visible(self):
+        self._visible_pending = False
+        wanted: Dict[str, Path] = {}
+        # 썸네일 줄(지금 보고 있는 게시물)을 먼저
+        if self._strip_files:
+            cell = STRIP_THUMB + STRIP_PAD
+            x0 = self.strip.canvasx(0); x1 = self.strip.canvasx(self.strip.winfo_width())
+            first = max(0, int(x0 // cell)); last = min(len(self._strip_files) - 1, int(x1 // cell))
+            for src in self._strip_files[first:last + 1]:
+                wanted[str(src)] = src
+        step = ROW_THUMB + 4
+        for y in range(1, max(2, self.tree.winfo_height()), step):
+            iid = self.tree.identify_row(y)
+            meta = self._posts.get(iid) if iid else None
+            if meta and meta["files"]:
+                src = meta["files"][0]
+                wanted.setdefault(str(src), src)
+        self._loader.want((k, p) for k, p in wanted.items() if k not in self._thumb_pil)
+
+    def _on_thumb(self, payload):
+        key, im = payload
+        if im is None:
+            return
+        self._thumb_pil[key] = im
+        for iid in self._rows_by_src.get(key, ()):
+            if self.tree.exists(iid):
+                self.tree.item(iid, image=self._row_image(key))
+        item = self._strip_items.get(key)
+        if item is not None:
+            self.strip.itemconfigure(item, image=self._strip_image(key))
@@ -3,42 +3,11 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk
 from collections import deque
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import Image, ImageTk, ImageDraw, ImageColor
 from typing import Callable, Tuple, Optional, Dict
 
-_DEFAULT_FONTS = [
-    "arial.ttf", "tahoma.ttf", "segoeui.ttf",
-    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-]
-
-def _pick_font(size: int, font_path: Optional[str] = None):
-    if font_path:
-        try:
-            return ImageFont.truetype(font_path, size=size)
-        except Exception:
-            pass
-    for cand in _DEFAULT_FONTS:
-        try:
-            return ImageFont.truetype(cand, size=size)
-        except Exception:
-            pass
-    return ImageFont.load_default()
-
-def _measure_text(font, text, stroke_width=0):
-    d = ImageDraw.Draw(Image.new("RGB", (10, 10)))
-    bbox = d.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
-    return bbox[2] - bbox[0], bbox[3] - bbox[1]
-
-def _fit_font_by_width(text: str, target_w: int, low=8, high=512, stroke_width=2, font_path: Optional[str]=None):
-    best = low
-    while low <= high:
-        mid = (low + high) // 2
-        w, _ = _measure_text(_pick_font(mid, font_path), text, stroke_width=stroke_width)
-        if w <= target_w:
-            best = mid; low = mid + 1
-        else:
-            high = mid - 1
-    return best
+# 폰트/레이아웃 캐시는 배치 렌더와 공유
+from services.watermark import pick_font, fit_font_by_width, measure_text
 
 
 class _CheckerCanvas(tk.Canvas):
@@ -46,14 +15,25 @@ class _CheckerCanvas(tk.Canvas):
     - after_idle로 배경/이미지 렌더
     - 드래그/그리드 선택은 오버레이만 변경(초경량)
     - PhotoImage 강참조 유지
+    - 이미지마다 밉맵(1/2씩 축소) 피라미드를 한 번 만들어, 가장 가까운 레벨에서 리샘플
+      창 크기 조절 중엔 빠른 필터, 멈춘 뒤 HQ_DELAY_MS 후 한 번 LANCZOS
     """
+    PYRAMID_MIN = 64     # 이보다 작은 레벨은 만들지 않음(px, 짧은 변)
+    HQ_DELAY_MS = 150    # 크기 조절이 멈춘 뒤 고품질 렌더까지 대기
+
     def __init__(self, master, tile=12, c1="#E6E6E6", c2="#C8C8C8", **kw):
         super().__init__(master, highlightthickness=0, background="white", **kw)
         self.tile = tile; self.c1, self.c2 = c1, c2
         self._pil_img: Image.Image | None = None
+        self._pyramid: list[Image.Image] = []
         self._img_id: int | None = None
         self._img_refs = deque(maxlen=4)  # 본문 이미지 강참조
 
+        # 체크보드: 캔버스보다 큰 비트맵 한 장(아이템 1개). 캔버스가 잘라 보여 주므로 커질 때만 다시 만든다
+        self._checker_id: Optional[int] = None
+        self._checker_tk: Optional[ImageTk.PhotoImage] = None
+        self._checker_size = (0, 0)
+
         # 레이아웃(캔버스/이미지 박스)
         self._last = {"w":1,"h":1,"x0":0,"y0":0,"iw":1,"ih":1}
 
@@ -75,11 +55,14 @@ class _CheckerCanvas(tk.Canvas):
 
         # 렌더 큐
         self._pending = False
+        self._pending_hq = False
+        self._hq_after: Optional[str] = None
         self.bind("<Configure>", self._on_resize)
 
     # ---------- Public API ----------
     def set_image(self, pil_img: Image.Image | None):
         self._pil_img = pil_img
+        self._pyramid = self._build_pyramid(pil_img) if pil_img is not None else []
         self._queue_render()
 
     def set_grid_visible(self, visible: bool):
@@ -113,13 +96,64 @@ class _CheckerCanvas(tk.Canvas):
         return (min(1.0, max(0.0, nx)), min(1.0, max(0.0, ny)))
 
     # ---------- Internal ----------
-    def _queue_render(self):
+    def _queue_render(self, hq: bool = True):
+        self._pending_hq = self._pending_hq or hq
         if not self._pending:
             self._pending = True
             self.after_idle(self._render_full)
 
     def _on_resize(self, _):
-        self._queue_render()
+        # 크기 조절 중엔 빠른 렌더만, 멈추면 한 번 고품질로
+        self._queue_render(hq=False)
+        if self._hq_after is not None:
+            self.after_cancel(self._hq_after)
+        self._hq_after = self.after(self.HQ_DELAY_MS, self._on_resize_settled)
+
+    def _on_resize_settled(self):
+        self._hq_after = None
+        self._queue_render(hq=True)
+
+    # ---- 체크보드 ----
+    def _ensure_checker(self, w: int, h: int):
+        cw, ch = self._checker_size
+        if self._checker_id is not None and cw >= w and ch >= h:
+            return
+        # 보통은 화면 크기로 한 번만 만들면 이후 크기 조절엔 다시 만들 일이 없다
+        w = max(w, cw, self.winfo_screenwidth()); h = max(h, ch, self.winfo_screenheight())
+        self._checker_tk = ImageTk.PhotoImage(self._checker_bitmap(w, h))
+        self._checker_size = (w, h)
+        if self._checker_id is None:
+            self._checker_id = self.create_image(0, 0, image=self._checker_tk, anchor="nw", tags="checker")
+        else:
+            self.itemconfigure(self._checker_id, image=self._checker_tk)
+
+    def _checker_bitmap(self, w: int, h: int) -> Image.Image:
+        t = self.tile
+        c1, c2 = ImageColor.getrgb(self.c1), ImageColor.getrgb(self.c2)
+        cell = Image.new("RGB", (2 * t, 2 * t), c1)
+        cell.paste(c2, (t, 0, 2 * t, t)); cell.paste(c2, (0, t, t, 2 * t))
+        # 한 줄을 만든 뒤 줄을 세로로 복사(붙이기 횟수 ~ 가로+세로 칸 수)
+        row = Image.new("RGB", (w, 2 * t))
+        for x in range(0, w, 2 * t):
+            row.paste(cell, (x, 0))
+        img = Image.new("RGB", (w, h))
+        for y in range(0, h, 2 * t):
+            img.paste(row, (0, y))
+        return img
+
+    # ---- 밉맵 ----
+    def _build_pyramid(self, img: Image.Image) -> list[Image.Image]:
+        levels = [img]
+        while min(levels[-1].size) >= 2 * self.PYRAMID_MIN:
+            levels.append(levels[-1].reduce(2))
+        return levels
+
+    def _pyramid_level(self, iw: int, ih: int) -> Image.Image:
+        """(iw, ih) 이상인 레벨 중 가장 작은 것(축소만 하도록)."""
+        for im in reversed(self._pyramid):
+            if im.width >= iw and im.height >= ih:
+                return im
+        return self._pyramid[0]
 
     # ---- 풀 렌더 ----
     def _render_full(self):
@@ -127,17 +161,10 @@ class _CheckerCanvas(tk.Canvas):
         w = max(1, self.winfo_width()); h = max(1, self.winfo_height())
         if w < 4 or h < 4:
             self.after(16, self._render_full); return
+        hq = self._pending_hq; self._pending_hq = False
 
         # 체크보드
-        self.delete("checker")
-        t = self.tile
-        cols = (w + t - 1) // t; rows = (h + t - 1) // t
-        for r in range(rows):
-            for c in range(cols):
-                x0 = c * t; y0 = r * t
-                x1 = min(x0 + t, w); y1 = min(y0 + t, h)
-                color = self.c1 if (r + c) % 2 == 0 else self.c2
-                self.create_rectangle(x0, y0, x1, y1, fill=color, width=0, tags="checker")
+        self._ensure_checker(w, h)
         self.tag_lower("checker")
 
         # 이미지
@@ -152,7 +179,11 @@ class _CheckerCanvas(tk.Canvas):
         iw, ih = max(1, int(W*scale)), max(1, int(H*scale))
         x0, y0 = (w - iw)//2, (h - ih)//2
 
-        disp = self._pil_img.resize((iw, ih), Image.Resampling.LANCZOS)
+        src = self._pyramid_level(iw, ih)
+        if src.size == (iw, ih):
+            disp = src
+        else:
+            disp = src.resize((iw, ih), Image.Resampling.LANCZOS if hq else Image.Resampling.BILINEAR)
         tkimg = ImageTk.PhotoImage(disp)
         self._img_refs.append(tkimg)
 
@@ -240,9 +271,9 @@ class _CheckerCanvas(tk.Canvas):
             return  # 캐시 재사용
 
         # 새 스프라이트 생성 (선택 폰트 우선)
-        font = _pick_font(_fit_font_by_width(txt, target_w, stroke_width=sw, font_path=font_path),
-                          font_path=font_path)
-        tw, th = _measure_text(font, txt, stroke_width=sw)
+        font = pick_font(fit_font_by_width(txt, target_w, stroke_width=sw, font_path=font_path),
+                         font_path=font_path)
+        tw, th = measure_text(font, txt, stroke_width=sw)
         alpha = int(255 * (op / 100.0))
         fill_rgba = (fill[0], fill[1], fill[2], alpha)
         stroke_rgba = (stroke[0], stroke[1], stroke[2], alpha)
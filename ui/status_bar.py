@@ -4,21 +4,59 @@ import tkinter as tk
 from tkinter import ttk
 
 class StatusBar(ttk.Frame):
-    def __init__(self, master, on_start):
+    def __init__(self, master, on_start, on_pause=None, on_resume=None, on_cancel=None):
         super().__init__(master)
         self._on_start = on_start
+        self._on_pause = on_pause
+        self._on_resume = on_resume
+        self._on_cancel = on_cancel
         self._total = 100
+        self._paused = False
 
         self.progress = ttk.Progressbar(self, mode="determinate", maximum=self._total, value=0)
         self.progress.pack(fill="x", expand=True, side="left", padx=4)
-        ttk.Button(self, text="Start Batch", command=self._on_start).pack(side="left", padx=6)
+        self.lbl_state = ttk.Label(self, text="", width=10)
+        self.lbl_state.pack(side="left")
+        self.btn_start = ttk.Button(self, text="Start Batch", command=self._on_start)
+        self.btn_start.pack(side="left", padx=6)
+        self.btn_pause = ttk.Button(self, text="Pause", command=self._toggle_pause, state="disabled")
+        self.btn_pause.pack(side="left")
+        self.btn_stop = ttk.Button(self, text="Stop", command=self._stop, state="disabled")
+        self.btn_stop.pack(side="left", padx=6)
 
     def reset(self, total: int):
         self._total = max(1, total)
         self.progress.configure(maximum=self._total, value=0)
+        self._set_running(True)
 
     def set_progress(self, value: int):
         self.progress.configure(value=value)
 
-    def finish(self):
-        self.progress.configure(value=self._total)
+    def finish(self, cancelled: bool = False):
+        if not cancelled:
+            self.progress.configure(value=self._total)
+        self._set_running(False)
+        self.lbl_state.configure(text="Stopped" if cancelled else "")
+
+    # ----- Internal -----
+    def _set_running(self, running: bool):
+        self._paused = False
+        self.btn_pause.configure(text="Pause", state="normal" if running else "disabled")
+        self.btn_stop.configure(state="normal" if running else "disabled")
+        self.btn_start.configure(state="disabled" if running else "normal")
+        self.lbl_state.configure(text="Running" if running else "")
+
+    def _toggle_pause(self):
+        # 일시정지: 새 작업 투입만 멈춤(진행 중인 작업은 마저 끝남)
+        self._paused = not self._paused
+        if self._paused:
+            self.btn_pause.configure(text="Resume"); self.lbl_state.configure(text="Paused")
+            if self._on_pause: self._on_pause()
+        else:
+            self.btn_pause.configure(text="Pause"); self.lbl_state.configure(text="Running")
+            if self._on_resume: self._on_resume()
+
+    def _stop(self):
+        self.btn_pause.configure(state="disabled"); self.btn_stop.configure(state="disabled")
+        self.lbl_state.configure(text="Stopping…")
+        if self._on_cancel: self._on_cancel()
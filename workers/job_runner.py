@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import multiprocessing as mp
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from settings import AppSettings, default_workers
+from services.image_ops import max_target_box
+from services.metrics import NULL_TIMER, StageTimer
+from services.pipeline import load_source, render_size, shared_intermediate
+from services.planner import Job, Output
+from services.writer import encode_image, encode_target, get_profile
+from workers.prefetch import Prefetcher
+from workers.writer_stage import AsyncWriter
+
+# ---- 워커 프로세스 측 ----
+_worker_settings: Optional[AppSettings] = None
+
+def _init_worker(settings: AppSettings):
+    # 배치 동안 설정은 고정이므로 프로세스당 한 번만 전달
+    global _worker_settings
+    _worker_settings = settings
+
+JobResult = Tuple[List[Union[bytes, BaseException]], Optional[dict]]
+
+def run_job(job: Job, settings: Optional[AppSettings] = None, data: Optional[bytes] = None) -> JobResult:
+    """(job.outputs 순서대로 출력별 인코딩된 바이트(settings.output_profile 형식) 또는 예외, 계측 결과(꺼져 있으면 None)).
+    디스크 쓰기는 부모의 writer 단계가 한다. data는 미리 읽은 원본 바이트(없으면 파일을 직접 연다).
+    원본 디코드가 실패하면 예외를 그대로 올린다(모든 출력 실패)."""
+    settings = settings or _worker_settings
+    timer = StageTimer() if settings.profile else NULL_TIMER
+    prof = get_profile(settings.output_profile)
+    with timer.stage("decode"):
+        im = load_source(job.src, max_target_box(out.size for out in job.outputs), data)
+    if timer.enabled:
+        timer.add_bytes("decode", len(data) if data is not None else job.src.stat().st_size)
+        timer.info["prefetched"] = data is not None
+        timer.info["mp_decoded"] = im.width * im.height / 1e6
+        timer.info["mp_out"] = sum(w * h for (w, h) in (o.size for o in job.outputs)) / 1e6
+    with timer.stage("resize"):
+        # 규격이 여러 개면 공유 중간본을 한 번 만들고 거기서 각 규격을 뽑는다
+        im = shared_intermediate(im, [out.size for out in job.outputs])
+    results: List[Union[bytes, BaseException]] = []
+    for out in job.outputs:
+        # 한 규격 실패가 나머지 규격을 막지 않도록 출력별로 처리
+        try:
+            img = render_size(im, out.size, settings, job.wm_text, timer)
+            budget = settings.byte_budget(out.size)
+            with timer.stage("encode"):
+                if budget:
+                    buf, q = encode_target(img, prof, budget, settings.output_effort)
+                else:
+                    buf = encode_image(img, prof, settings.output_effort)
+            if budget and q is not None and timer.enabled:
+                w, h = out.size
+                timer.info.setdefault("quality", {})[f"{w}x{h}"] = [q, len(buf), budget]
+            timer.add_bytes("encode", len(buf))
+            results.append(buf)
+        except Exception as e:
+            results.append(e)
+    return results, (timer.to_dict() if timer.enabled else None)
+
+
+class RunControl:
+    """배치 취소/일시정지(협조적). 러너는 새 작업을 넣기 전에만 확인한다.
+    → 일시정지/취소해도 이미 돌고 있는 작업은 끝까지 처리된다."""
+    def __init__(self):
+        self._cancel = threading.Event()
+        self._running = threading.Event(); self._running.set()
+
+    def cancel(self):
+        self._cancel.set(); self._running.set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def wait_resumed(self, timeout: float | None = None) -> bool:
+        return self._running.wait(timeout)
+
+
+class JobRunner:
+    """Job 목록을 프로세스 풀로 분산 실행.
+    - 결과 콜백은 제출 순서대로, run()을 호출한 스레드에서 불린다.
+    - 동시에 떠 있는 작업 수는 workers * 2로 제한(대량 배치에서도 메모리 일정).
+    - settings.prefetch_mb > 0이면 원본 읽기를 I/O 스레드로 앞당겨 연산과 겹친다.
+      미리 읽은 바이트는 결과를 수거할 때까지 예산에 잡혀 있다(제출 대기 중인 버퍼까지 prefetch_mb 안).
+      예산이 차도 워커 수만큼은 항상 띄운다(최악: prefetch_mb + 워커 수 × 원본 크기).
+    - 워커는 메모리에서 인코딩만 하고, 파일 쓰기는 AsyncWriter 스레드가 맡는다.
+    """
+    def __init__(self, settings: AppSettings, workers: int | None = None, control: RunControl | None = None):
+        self.settings = settings
+        self.workers = max(1, int(workers or settings.workers or default_workers()))
+        self.control = control or RunControl()
+        self._prefetch: Optional[Prefetcher] = None
+
+    def run(self, jobs: Iterable[Job], on_result: Callable[[Job, Output, Optional[BaseException]], None],
+            on_metrics: Callable[[Job, dict], None] | None = None):
+        """on_result(job, output, err)는 출력(파일 × 규격)마다 한 번씩, 파일 쓰기가 끝난 뒤
+        writer 스레드에서 제출 순서대로 불린다.
+        on_metrics(job, metrics)는 계측이 켜져 있을 때 원본마다 한 번(run()을 호출한 스레드, 렌더 단계),
+        그리고 출력마다 한 번(writer 스레드, write 단계). 받는 쪽은 원본 기준으로 합산할 것(RunReport.add).
+        취소되면 아직 시작하지 않은 작업은 콜백 없이 버린다(이미 인코딩된 출력은 끝까지 쓴다)."""
+        budget = max(0, int(self.settings.prefetch_mb)) * 1024 * 1024
+        self._prefetch = Prefetcher(budget) if budget else None
+        source = self._prefetch.iter(jobs) if self._prefetch else ((job, None) for job in jobs)
+        writer = AsyncWriter(on_result, fsync_group=self.settings.fsync_group,
+                             copy=self.settings.dedup == "copy", on_metrics=on_metrics)
+        try:
+            self._run(source, writer, on_metrics)
+        finally:
+            source.close()  # 남은 미리 읽기 중단
+            writer.close()
+
+    def _run(self, source, writer: AsyncWriter, on_metrics):
+        if self.workers == 1:
+            # 단일 워커면 풀 생성 비용 없이 현재 스레드에서 처리
+            for job, data in source:
+                while self.control.paused and not self.control.cancelled:
+                    self.control.wait_resumed(0.2)
+                if self.control.cancelled:
+                    return
+                try:
+                    result = run_job(job, self.settings, data)
+                except Exception as e:
+                    result = ([e] * len(job.outputs), None)
+                self._report(job, result, writer, on_metrics)
+            return
+
+        window = self.workers * 2
+        pending: deque[tuple[Job, Future]] = deque()
+        # spawn: Tk 메인 스레드가 살아있는 프로세스에서 fork하지 않도록
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.settings,),
+        ) as pool:
+            for job, data in source:
+                # 일시정지 중엔 새 작업을 넣지 않고, 떠 있는 작업 결과만 받아낸다
+                while self.control.paused and not self.control.cancelled:
+                    if pending and pending[0][1].done():
+                        self._drain_one(pending, writer, on_metrics)
+                    else:
+                        self.control.wait_resumed(0.2)
+                if self.control.cancelled:
+                    break
+                pending.append((job, pool.submit(run_job, job, None, data)))
+                del data
+                # 개수(window)와 미리 읽은 바이트(prefetch 예산) 둘 다 넘지 않게 수거.
+                # 단 예산 때문에 동시 실행이 workers 아래로 떨어지지는 않게 한다
+                while pending and (len(pending) >= window or
+                                   (len(pending) >= self.workers and self._prefetch and self._prefetch.full)):
+                    self._drain_one(pending, writer, on_metrics)
+            if self.control.cancelled:
+                for _, fut in pending:
+                    fut.cancel()  # 아직 시작 안 한 것만 취소됨
+            while pending:
+                self._drain_one(pending, writer, on_metrics)
+
+    def _drain_one(self, pending: deque, writer: AsyncWriter, on_metrics=None):
+        job, fut = pending.popleft()
+        if fut.cancelled():
+            self._release(job)
+            return
+        try:
+            result = fut.result()
+        except Exception as e:
+            result = ([e] * len(job.outputs), None)
+        self._report(job, result, writer, on_metrics)
+
+    def _release(self, job: Job):
+        # 원본 바이트를 더는 잡고 있지 않음 → 미리 읽기 예산 반환
+        if self._prefetch:
+            self._prefetch.release(job)
+
+    def _report(self, job: Job, result: JobResult, writer: AsyncWriter, on_metrics=None):
+        self._release(job)
+        outcomes, metrics = result
+        if metrics is not None and on_metrics:
+            on_metrics(job, metrics)
+        for out, res in zip(job.outputs, outcomes):
+            if isinstance(res, BaseException):
+                writer.submit(job, out, None, res)
+            else:
+                writer.submit(job, out, res)
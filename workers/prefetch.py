@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Iterable, Iterator, Optional, Tuple
+
+from services.planner import Job
+
+PREFETCH_IO_THREADS = 4  # 동시 읽기 수(SMB/NFS 왕복 지연을 가리는 정도면 충분)
+
+def _read_bytes(job: Job) -> bytes:
+    with open(job.src, "rb") as f:
+        return f.read()
+
+class Prefetcher:
+    """다가올 작업의 원본 파일을 I/O 스레드로 미리 메모리에 읽어 둔다.
+    - 읽는 중/읽어 둔 버퍼 + 넘겨줬지만 아직 release()되지 않은 버퍼 합이 budget_bytes를 넘지 않게 앞서 읽는다
+      (앞서 읽은 것이 없으면 1개는 항상 허용)
+    - 작업 순서는 그대로, (job, data)로 넘긴다. 읽기 실패 시 data=None → 워커가 직접 열어 오류를 보고
+    - 소비자는 data를 다 쓴 뒤(결과 수거 시점) 작업마다 release(job)을 한 번 부른다
+    """
+    def __init__(self, budget_bytes: int, io_threads: int = PREFETCH_IO_THREADS):
+        self.budget_bytes = max(0, int(budget_bytes))
+        self.io_threads = max(1, int(io_threads))
+        self._held = 0  # 넘겨준 뒤 아직 release되지 않은 바이트
+        self._lock = threading.Lock()
+
+    @property
+    def full(self) -> bool:
+        """넘겨준 버퍼만으로 예산이 찼는지. 찼으면 소비자가 결과를 수거(release)한 뒤 다음을 받아야 한다."""
+        return self._held >= self.budget_bytes
+
+    def release(self, job: Job):
+        with self._lock:
+            self._held -= job.src_bytes
+
+    def iter(self, jobs: Iterable[Job]) -> Iterator[Tuple[Job, Optional[bytes]]]:
+        it = iter(jobs)
+        ahead: Deque[Tuple[Job, Future]] = deque()
+        used = 0
+        nxt: Optional[Job] = next(it, None)
+        pool = ThreadPoolExecutor(self.io_threads, thread_name_prefix="prefetch")
+        try:
+            while ahead or nxt is not None:
+                # 예산 안에서 최대한 앞서 읽기 요청
+                while nxt is not None and (not ahead or used + self._held + nxt.src_bytes <= self.budget_bytes):
+                    ahead.append((nxt, pool.submit(_read_bytes, nxt)))
+                    used += nxt.src_bytes
+                    nxt = next(it, None)
+                job, fut = ahead.popleft()
+                used -= job.src_bytes
+                with self._lock:
+                    self._held += job.src_bytes
+                try:
+                    data: Optional[bytes] = fut.result()
+                except OSError:
+                    data = None
+                yield job, data
+        finally:
+            # 취소 등으로 소비가 중단되면 남은 읽기는 버린다
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+PREVIEW_DEBOUNCE_S = 0.03  # 이 시간 동안 새 요청이 없어야 렌더 시작(연속 클릭/옵션 변경 묶기)
+
+OnPreviewDone = Callable[[int, Any, Optional[BaseException]], None]
+
+class PreviewRenderer:
+    """미리보기 렌더를 백그라운드 스레드 하나에서 처리(Tk 메인 스레드를 막지 않도록).
+    - submit()은 대기 중인 요청을 덮어쓴다 → 가장 최근 요청만 렌더, 세대 번호 반환
+    - 렌더가 끝났을 때 더 새 요청이 들어와 있으면 결과를 버린다
+    on_done(gen, result, err)은 워커 스레드에서 불린다(UI는 이벤트 채널로 넘겨서 세대를 다시 확인).
+    """
+    def __init__(self, on_done: OnPreviewDone, debounce_s: float = PREVIEW_DEBOUNCE_S):
+        self.on_done = on_done
+        self.debounce_s = debounce_s
+        self._cond = threading.Condition()
+        self._pending: Optional[Tuple[int, Callable[[], Any]]] = None
+        self._gen = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="preview", daemon=True)
+        self._thread.start()
+
+    @property
+    def latest(self) -> int:
+        """가장 최근 요청의 세대 번호. 이보다 오래된 결과는 화면에 올리지 않는다."""
+        return self._gen
+
+    def submit(self, render: Callable[[], Any]) -> int:
+        with self._cond:
+            self._gen += 1
+            self._pending = (self._gen, render)
+            self._cond.notify()
+            return self._gen
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                # 디바운스: 기다리는 동안 새 요청이 오면 다시 기다린다
+                while not self._closed:
+                    gen = self._pending[0]
+                    self._cond.wait(self.debounce_s)
+                    if self._pending[0] == gen:
+                        break
+                if self._closed:
+                    return
+                gen, render = self._pending
+                self._pending = None
+            try:
+                result, err = render(), None
+            except Exception as e:
+                result, err = None, e
+            if gen == self._gen:  # 렌더 중 더 새 요청이 왔으면 버림
+                self.on_done(gen, result, err)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Hashable, Iterable, Optional, Set, Tuple
+
+from PIL import Image
+
+from services.thumbnails import ThumbnailCache
+
+THUMB_WORKERS = 2
+
+OnThumb = Callable[[Hashable, Optional[Image.Image]], None]
+
+class ThumbnailLoader:
+    """썸네일을 백그라운드 스레드로 만든다/읽는다.
+    - want()는 '지금 보이는' 항목으로 대기열을 통째로 바꾼다 → 스크롤로 지나간 항목은 만들지 않음
+    - 이미 끝났거나 진행 중인 키는 다시 요청하지 않는다
+    on_ready(key, image|None)은 워커 스레드에서 불린다(UI는 이벤트 채널로 넘길 것).
+    """
+    def __init__(self, on_ready: OnThumb, cache: Optional[ThumbnailCache] = None, workers: int = THUMB_WORKERS):
+        self.on_ready = on_ready
+        self.cache = cache or ThumbnailCache()
+        self._cond = threading.Condition()
+        self._queue: "OrderedDict[Hashable, Path]" = OrderedDict()
+        self._started: Set[Hashable] = set()
+        self._closed = False
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._loop, name=f"thumb-{i}", daemon=True).start()
+
+    def want(self, items: Iterable[Tuple[Hashable, Path]]):
+        with self._cond:
+            self._queue = OrderedDict((k, p) for k, p in items if k not in self._started)
+            self._cond.notify_all()
+
+    def forget(self):
+        """목록이 바뀜(재스캔 등) → 대기열과 완료 기록을 비운다(디스크 캐시는 유지)."""
+        with self._cond:
+            self._queue.clear(); self._started.clear()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                key, src = self._queue.popitem(last=False)
+                self._started.add(key)
+            try:
+                im = self.cache.get(src)
+            except Exception:
+                im = None  # 깨진 파일 등: 썸네일 없이 표시
+            self.on_ready(key, im)
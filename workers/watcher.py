@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Set, Tuple
+
+from settings import RootConfig
+from services.discovery import list_images, list_post_dirs
+
+# 파일 시스템 이벤트(inotify/FSEvents/ReadDirectoryChangesW)는 선택적
+try:
+    from watchdog.observers import Observer  # type: ignore
+    from watchdog.events import FileSystemEventHandler  # type: ignore
+    WATCHDOG_AVAILABLE = True
+except Exception:
+    Observer = None  # type: ignore
+    FileSystemEventHandler = object  # type: ignore
+    WATCHDOG_AVAILABLE = False
+
+Signature = Dict[str, Tuple[int, int]]  # 이미지 경로 → (size, mtime_ns)
+
+@dataclass
+class _DirtyPost:
+    root: RootConfig
+    post_name: str
+    sig: Signature = field(default_factory=dict)
+    changed_at: float = 0.0
+
+def _signature(post_dir: str) -> Signature:
+    sig: Signature = {}
+    for p in list_images(post_dir):
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue  # 업로드 중 이름 바뀜 등
+        sig[str(p)] = (st.st_size, st.st_mtime_ns)
+    return sig
+
+
+class _EventHandler(FileSystemEventHandler):  # type: ignore[misc]
+    """이벤트가 난 경로 → 소속 게시물 폴더를 dirty로 표시만 한다(판정은 폴링 틱에서)."""
+    def __init__(self, watcher: "PostWatcher", index: int, root: RootConfig):
+        super().__init__()
+        self._watcher = watcher
+        self._index = index
+        self._root = root
+
+    def on_any_event(self, event):
+        for attr in ("src_path", "dest_path"):
+            path = getattr(event, attr, None)
+            if path:
+                self._watcher._mark_path(self._index, self._root, str(path))
+
+
+class PostWatcher:
+    """입력 루트를 감시해, 새로 들어오거나 바뀐 이미지를 게시물 단위로 모아 넘긴다.
+    - watchdog이 있으면 OS 이벤트로 변경 폴더를 즉시 파악, 없으면 폴더 mtime 폴링
+    - 폴더 내용(크기/mtime)이 settle_s 동안 그대로여야 '업로드 끝'으로 보고 처리
+    - on_ready(posts)에는 바뀐 파일만 담긴 posts dict(컨트롤러 형식)를 준다
+    """
+    def __init__(
+        self,
+        roots: List[RootConfig],
+        on_ready: Callable[[Dict[str, dict]], None],
+        settle_s: float = 5.0,
+        poll_s: float = 2.0,
+        rescan_s: float = 300.0,
+        use_events: bool = True,
+    ):
+        self.roots = roots
+        self.on_ready = on_ready
+        self.settle_s = settle_s
+        self.poll_s = poll_s
+        self.rescan_s = rescan_s  # 폴더 mtime으로 안 잡히는 제자리 덮어쓰기 대비 전체 점검 주기
+        self.use_events = use_events and WATCHDOG_AVAILABLE
+        self._dir_mtime: Dict[str, int] = {}
+        self._seen: Signature = {}
+        self._dirty: Dict[str, _DirtyPost] = {}
+        self._event_dirs: Set[Tuple[int, str]] = set()
+        self._event_lock = threading.Lock()
+        self._last_rescan = 0.0
+
+    # ---- 초기 상태 ----
+    def prime(self):
+        """현재 있는 파일은 처리된 것으로 간주(이후 변경분만 감시)."""
+        for rc in self.roots:
+            for name, path, mtime in list_post_dirs(rc.path):
+                self._dir_mtime[path] = mtime
+                self._seen.update(_signature(path))
+        self._last_rescan = time.monotonic()
+
+    # ---- 루프 ----
+    def run(self, stop: threading.Event):
+        observer = None
+        if self.use_events:
+            observer = Observer()
+            for i, rc in enumerate(self.roots):
+                if Path(rc.path).exists():
+                    observer.schedule(_EventHandler(self, i, rc), str(rc.path), recursive=True)
+            observer.start()
+        try:
+            while not stop.is_set():
+                self.tick(time.monotonic())
+                stop.wait(self.poll_s)
+        finally:
+            if observer is not None:
+                observer.stop(); observer.join()
+
+    def tick(self, now: float):
+        full = now - self._last_rescan >= self.rescan_s
+        if full:
+            self._last_rescan = now
+        self._collect_dirty(full, now)
+        ready: Dict[str, dict] = {}
+        for post_dir, d in list(self._dirty.items()):
+            sig = _signature(post_dir)
+            if sig != d.sig:
+                d.sig = sig; d.changed_at = now   # 아직 바뀌는 중 → 디바운스 재시작
+                continue
+            if now - d.changed_at < self.settle_s:
+                continue
+            del self._dirty[post_dir]
+            changed = {p for p, v in sig.items() if self._seen.get(p) != v}
+            self._seen.update(sig)
+            if changed:
+                key = f"{Path(d.root.path).name}/{d.post_name}"
+                files = [p for p in list_images(post_dir) if str(p) in changed]
+                ready[key] = {"root": d.root, "post_name": d.post_name, "files": files}
+        if ready:
+            self.on_ready(ready)
+
+    # ---- 내부 ----
+    def _collect_dirty(self, full: bool, now: float):
+        with self._event_lock:
+            events, self._event_dirs = self._event_dirs, set()
+        for i, rc in enumerate(self.roots):
+            if self.use_events:
+                # 이벤트 모드: 평소엔 이벤트가 난 폴더만
+                for ri, path in events:
+                    if ri == i:
+                        self._mark_dirty(rc, path)
+                if not full:
+                    continue
+            for name, path, mtime in list_post_dirs(rc.path):
+                if self._dir_mtime.get(path) != mtime:
+                    self._dir_mtime[path] = mtime
+                    self._mark_dirty(rc, path)
+                elif full and path not in self._dirty:
+                    # 전체 점검: 서명을 한 번만 떠서 본 적 없는 내용이 있는 게시물만 디바운스에 올린다
+                    sig = _signature(path)
+                    if any(self._seen.get(p) != v for p, v in sig.items()):
+                        self._dirty[path] = _DirtyPost(root=rc, post_name=name, sig=sig, changed_at=now)
+
+    def _mark_dirty(self, rc: RootConfig, post_dir: str):
+        if post_dir not in self._dirty and os.path.isdir(post_dir):
+            self._dirty[post_dir] = _DirtyPost(root=rc, post_name=os.path.basename(post_dir), sig={}, changed_at=0.0)
+
+    def _mark_path(self, index: int, rc: RootConfig, path: str):
+        # 루트 바로 아래 폴더(=게시물)로 환원
+        try:
+            rel = Path(path).relative_to(rc.path)
+        except ValueError:
+            return
+        if not rel.parts:
+            return
+        post_dir = str(Path(rc.path) / rel.parts[0])
+        with self._event_lock:
+            self._event_dirs.add((index, post_dir))
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+from services.dedup import link_or_copy
+from services.metrics import NULL_TIMER, StageTimer
+from services.planner import Job, Output
+from services.writer import tmp_path, write_atomic
+
+WRITE_QUEUE_SIZE = 32  # 인코딩된 출력 대기 상한(초과 시 submit이 막혀 메모리 일정)
+
+OnWritten = Callable[[Job, Output, Optional[BaseException]], None]
+OnMetrics = Callable[[Job, dict], None]
+
+def _fsync_dir(path: Path):
+    # rename 자체를 디스크에 남기려면 폴더도 fsync(POSIX만; Windows는 폴더 핸들 fsync 불가)
+    if os.name != "posix":
+        return
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class AsyncWriter:
+    """인코딩된 출력 바이트를 디스크에 쓰는 전용 스레드.
+    - 큐가 가득 차면 submit()이 막힌다(워커가 디스크보다 빠를 때 메모리 상한)
+    - 임시파일에 쓰고 rename → 최종 이름으로 쓰다 만 JPEG가 남지 않는다
+    - fsync_group > 0이면 그 개수(또는 큐가 빌 때)씩 모아 fsync → rename → 폴더 fsync
+    - out.dups(중복 제거된 출력)는 out을 쓴 뒤 하드링크(copy=True면 복사)로 만든다
+    on_written(job, out, err)은 쓰기가 끝난 뒤 writer 스레드에서 제출 순서대로 불린다(dups도 각각;
+    dups의 원본 경로는 job.src가 아니라 out.src).
+    on_metrics가 있으면 출력마다 write 단계(임시파일 쓰기/fsync/rename/dups 링크)의 시간·바이트를
+    {"stages": {"write": [wall, cpu, bytes]}} 형태로 넘긴다(writer 스레드).
+    """
+    def __init__(self, on_written: OnWritten, queue_size: int = WRITE_QUEUE_SIZE, fsync_group: int = 0,
+                 copy: bool = False, on_metrics: Optional[OnMetrics] = None):
+        self.on_written = on_written
+        self.on_metrics = on_metrics
+        self.fsync_group = max(0, int(fsync_group))
+        self.copy = copy
+        self._q: "queue.Queue[Optional[Tuple[Job, Output, Optional[bytes], Optional[BaseException]]]]" = queue.Queue(max(1, queue_size))
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._loop, name="writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: Job, out: Output, data: Optional[bytes], err: Optional[BaseException] = None):
+        """data를 out.dst에 쓴다. err가 있으면(렌더 실패) 쓰지 않고 순서만 맞춰 통보."""
+        self._q.put((job, out, data, err))
+
+    def close(self):
+        """남은 쓰기를 모두 끝내고 종료. 콜백에서 난 예외는 여기서 다시 올린다."""
+        self._q.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    # ---- writer 스레드 ----
+    def _loop(self):
+        group: List[list] = []  # [job, out, file|None, err, timer]
+        while True:
+            item = self._q.get()
+            if item is None:
+                self._flush(group)
+                return
+            job, out, data, err = item
+            timer = StageTimer() if self.on_metrics else NULL_TIMER
+            if not self.fsync_group:
+                if err is None:
+                    try:
+                        with timer.stage("write"):
+                            write_atomic(data, out.dst)
+                        timer.add_bytes("write", len(data))
+                    except Exception as e:
+                        err = e
+                self._complete(job, out, err, timer)
+                continue
+            f = None
+            if err is None:
+                try:
+                    with timer.stage("write"):
+                        f = self._open_tmp(out.dst); f.write(data)
+                    timer.add_bytes("write", len(data))
+                except Exception as e:
+                    if f is not None: f.close()
+                    f = None; err = e
+            group.append([job, out, f, err, timer])
+            if len(group) >= self.fsync_group or self._q.empty():
+                self._flush(group)
+                group = []
+
+    @staticmethod
+    def _open_tmp(dst: Path):
+        try:
+            return open(tmp_path(dst), "wb")
+        except FileNotFoundError:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            return open(tmp_path(dst), "wb")
+
+    def _flush(self, group: List[list]):
+        dirs: Set[Path] = set()
+        for rec in group:
+            job, out, f, err, timer = rec
+            if f is None:
+                continue
+            try:
+                with timer.stage("write"):
+                    with f:
+                        f.flush(); os.fsync(f.fileno())
+                    os.replace(tmp_path(out.dst), out.dst)
+                dirs.add(out.dst.parent)
+            except Exception as e:
+                rec[3] = e
+        dir_timer = StageTimer() if self.on_metrics else NULL_TIMER
+        with dir_timer.stage("write"):
+            for d in dirs:
+                try:
+                    _fsync_dir(d)
+                except OSError:
+                    pass
+        written = [rec[4] for rec in group if rec[2] is not None and rec[3] is None]
+        if dir_timer.enabled and written:
+            # 폴더 fsync는 묶음 전체 몫 → 쓴 출력들에 고르게 나눈다
+            wall, cpu, _ = dir_timer.stages["write"]
+            for timer in written:
+                timer.add_time("write", wall / len(written), cpu / len(written))
+        for job, out, _, err, timer in group:
+            self._complete(job, out, err, timer)
+
+    def _complete(self, job: Job, out: Output, err: Optional[BaseException], timer=NULL_TIMER):
+        self._notify_one(job, out, err)
+        for dup in out.dups:
+            e = err
+            if e is None:
+                try:
+                    with timer.stage("write"):
+                        link_or_copy(out.dst, dup.dst, self.copy)
+                except Exception as x:
+                    e = x
+            self._notify_one(job, dup, e)
+        if timer.enabled and timer.stages and self._error is None:
+            try:
+                self.on_metrics(job, timer.to_dict())
+            except BaseException as e:
+                self._error = e
+
+    def _notify_one(self, job: Job, out: Output, err: Optional[BaseException]):
+        if self._error is not None:
+            return
+        try:
+            self.on_written(job, out, err)
+        except BaseException as e:
+            self._error = e  # 이후 통보는 멈추고 close()에서 전달